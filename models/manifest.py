@@ -61,6 +61,17 @@ class Photo(BaseModel):
         """EXIF timestamp preferred; falls back to file mtime."""
         return self.timestamp_exif or self.timestamp_file
 
+    @property
+    def ts_seconds_of_day(self) -> float | None:
+        """Wall-clock time of best_timestamp in seconds after midnight, for Stage 3b scoring.
+
+        Uses the timestamp's own hour/minute/second, i.e. local to its tzinfo.
+        """
+        ts = self.best_timestamp
+        if ts is None:
+            return None
+        return ts.hour * 3600 + ts.minute * 60 + ts.second + ts.microsecond / 1e6
+
 
 class TextSnippet(BaseModel):
     """A workshop-specific text file read from `data/text/`.
@@ -12,6 +12,7 @@ from PIL import Image
 from models.manifest import Photo, ProjectManifest, TextSnippet, WorkshopMeta, AgendaSession
 from settings import Settings
 from utils.agenda_parser import parse_agenda
+from utils.json_utils import dump_model
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +46,7 @@ def run(settings: Settings) -> ProjectManifest:
     )
 
     artifact_path = settings.cache_dir / "manifest.json"
-    artifact_path.write_text(manifest.model_dump_json(indent=2), encoding="utf-8")
+    artifact_path.write_bytes(dump_model(manifest))
 
     logger.info("Stage 1 complete → %s", artifact_path)
     logger.info("  Title:         %s", meta.title)
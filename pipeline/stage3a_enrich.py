@@ -10,22 +10,36 @@ All other photos reference the original file via processed_path.
 
 Reads:  data/.cache/manifest.json  (ProjectManifest)
 Writes: data/.cache/enriched_photos.json  (EnrichedPhotoSet)
-        data/.cache/analyses/<sha256>.json  (per-photo cache, never re-computed)
-        data/.cache/processed/<sha256>.jpg  (cropped document photos)
+        data/.cache/analyses/<key>.json  (per-photo cache, never re-computed)
+        data/.cache/processed/<key>.jpg  (cropped document photos)
+
+<key> is a BLAKE3 hash over the photo bytes, the vision model and the prompt and
+schema versions, so identical photos hit the cache under any filename or id
+while a model, prompt or schema change invalidates it.
+
+Uncached photos are analysed concurrently (AsyncOpenAI), with at most
+settings.vision_concurrency requests in flight.
 """
+import asyncio
 import base64
-import hashlib
+import functools
 import logging
+import mmap
+import os
 import random
-import time as time_module
+import tempfile
+from collections.abc import Awaitable, Callable
 from pathlib import Path
 
-from openai import OpenAI, RateLimitError
-from PIL import Image, ImageOps
+import orjson
+from blake3 import blake3
+from openai import AsyncOpenAI, RateLimitError
+from PIL import ExifTags, Image, ImageOps
 
 from models.enriched_photos import CropBox, EnrichedPhoto, EnrichedPhotoSet, PhotoAnalysis
 from models.manifest import Photo, ProjectManifest
 from settings import Settings
+from utils.json_utils import dump_model, load_model, write_if_changed
 
 logger = logging.getLogger(__name__)
 
@@ -52,32 +66,82 @@ Antworte ausschließlich im vorgegebenen JSON-Schema.
 # "better take more than less" — keeps a comfortable border around the document
 _CROP_MARGIN = 0.03
 
+# When an image is decoded only to be cropped/saved (batch results, cache
+# rebuilds), JPEGs may be decoded at 1/2, 1/4 or 1/8 scale as long as both
+# edges stay at or above this size — well beyond A4 print resolution.
+_PROCESSED_MIN_EDGE = 3000
+
+# The Vision API fits "high" detail images into 2048×2048 before tiling, so
+# anything larger only costs upload bandwidth. Crops still use full resolution.
+_API_MAX_EDGE = 2048
+
+# EXIF orientation → transpose that makes the image upright (as ImageOps.exif_transpose)
+_EXIF_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# Bump when _SYSTEM_PROMPT or PhotoAnalysis changes meaning; part of the cache key.
+_PROMPT_VERSION = "1"
+_SCHEMA_VERSION = "1"
+
 _MAX_RETRIES = 6
 
+# Batch API polling: first wait and upper bound for the doubling interval (seconds)
+_BATCH_POLL_INITIAL = 5.0
+_BATCH_POLL_MAX = 300.0
+_BATCH_TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
 # Document scene types that trigger cropping
 _DOCUMENT_SCENE_TYPES = frozenset({"flipchart"})
 
 
-def run(settings: Settings, manifest: ProjectManifest) -> EnrichedPhotoSet:
+def run(
+    settings: Settings,
+    manifest: ProjectManifest,
+    *,
+    _sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+) -> EnrichedPhotoSet:
     """Analyse all photos via GPT Vision. Results cached per content-hash.
 
+    Cache hits are resolved first; the remaining photos are sent to the
+    Vision API concurrently. ``_sleep`` is the rate-limit backoff hook.
+
     Returns the completed EnrichedPhotoSet and writes two artifacts:
-    - .cache/analyses/<sha256>.json  for each photo (persistent cache)
+    - .cache/analyses/<key>.json     for each photo (persistent cache)
     - .cache/enriched_photos.json    combined set for downstream stages
     """
     settings.analyses_dir.mkdir(parents=True, exist_ok=True)
     settings.processed_dir.mkdir(parents=True, exist_ok=True)
 
-    client = OpenAI(api_key=settings.openai_api_key)
-    enriched: list[EnrichedPhoto] = []
+    results: dict[str, EnrichedPhoto] = {}
+    pending: list[tuple[Photo, Path, str]] = []
 
     for photo in manifest.photos:
         photo_path = settings.project_dir / photo.path
         try:
-            result = _analyse_photo(photo, photo_path, client, settings)
+            cached, cache_key = _load_cached(photo, photo_path, settings)
         except Exception as exc:
             logger.warning("  [%s] %s — SKIPPED: %s", photo.id, photo.filename, exc)
             continue
+        if cached is not None:
+            results[photo.id] = cached
+        else:
+            pending.append((photo, photo_path, cache_key))
+
+    if pending:
+        results.update(asyncio.run(_analyse_pending(pending, settings, _sleep)))
+
+    enriched: list[EnrichedPhoto] = []
+    for photo in manifest.photos:
+        result = results.get(photo.id)
+        if result is None:
+            continue
         enriched.append(result)
         crop_note = " [cropped]" if result.crop_box else ""
         logger.info(
@@ -90,8 +154,7 @@ def run(settings: Settings, manifest: ProjectManifest) -> EnrichedPhotoSet:
 
     photo_set = EnrichedPhotoSet(enriched_photos=enriched)
 
-    artifact_path = settings.cache_dir / "enriched_photos.json"
-    artifact_path.write_text(photo_set.model_dump_json(indent=2), encoding="utf-8")
+    artifact_path = _write_artifact(photo_set, settings)
 
     logger.info("Stage 3a complete → %s", artifact_path)
     logger.info("  Photos analysed: %d", len(enriched))
@@ -104,126 +167,189 @@ def run(settings: Settings, manifest: ProjectManifest) -> EnrichedPhotoSet:
 # Per-photo analysis
 # ---------------------------------------------------------------------------
 
-def _analyse_photo(
+def _load_cached(
     photo: Photo,
     photo_path: Path,
-    client: OpenAI,
     settings: Settings,
-) -> EnrichedPhoto:
-    """Return cached analysis if available, otherwise call the Vision API."""
+) -> tuple[EnrichedPhoto | None, str]:
+    """Return (cached analysis or None, cache key) for one photo."""
     # Hash original bytes for a stable cache key independent of orientation correction
-    original_bytes = photo_path.read_bytes()
-    content_hash = hashlib.sha256(original_bytes).hexdigest()
-
-    # Normalised image (EXIF rotation applied) used for API and cropping
-    corrected_img, corrected_bytes = _load_corrected(photo_path)
-
-    cache_file = settings.analyses_dir / f"{content_hash}.json"
-    if cache_file.exists():
-        logger.debug("Cache hit for %s (%s)", photo.filename, content_hash[:12])
-        cached = EnrichedPhoto.model_validate_json(cache_file.read_text(encoding="utf-8"))
-        # Ensure processed file still exists (may have been deleted)
-        if cached.processed_path and not (settings.project_dir / cached.processed_path).exists():
-            cached = _apply_crop_to_photo(cached, corrected_img, content_hash, settings)
-            cache_file.write_text(cached.model_dump_json(indent=2), encoding="utf-8")
-        return cached
+    cache_key = _file_cache_key(photo_path, settings.vision_model)
+
+    cache_file = settings.analyses_dir / f"{cache_key}.json"
+    if not cache_file.exists():
+        return None, cache_key
+
+    logger.debug("Cache hit for %s (%s)", photo.filename, cache_key[:12])
+    cached = load_model(EnrichedPhoto, cache_file.read_bytes())
+    # Ensure processed file still exists (may have been deleted)
+    if cached.processed_path and not (settings.project_dir / cached.processed_path).exists():
+        processed_img = _load_for_processing(photo_path, cached.crop_box)
+        cached = cached.model_copy(
+            update={"processed_path": _save_processed(processed_img, cache_key, settings)}
+        )
+        _write_atomic(cache_file, dump_model(cached))
+    return cached, cache_key
 
-    logger.debug("Cache miss for %s — calling Vision API", photo.filename)
-    analysis = _call_vision_api(corrected_bytes, client, settings)
 
-    processed_path = _save_processed(
-        photo, corrected_img, analysis.crop_box, content_hash, settings
+async def _analyse_pending(
+    pending: list[tuple[Photo, Path, str]],
+    settings: Settings,
+    sleep: Callable[[float], Awaitable[None]],
+) -> dict[str, EnrichedPhoto]:
+    """Analyse uncached photos; failed photos are logged and left out.
+
+    Large sets go through the Batch API when enabled, everything else (and a
+    batch that does not complete) through concurrent per-photo requests.
+    """
+    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    try:
+        if settings.vision_use_batch_api and len(pending) >= settings.vision_batch_threshold:
+            try:
+                return await _analyse_via_batch(pending, client, settings, sleep)
+            except Exception as exc:
+                logger.warning(
+                    "Batch analysis failed (%s); falling back to per-photo requests.", exc
+                )
+        return await _analyse_concurrently(pending, client, settings, sleep)
+    finally:
+        await client.close()
+
+
+async def _analyse_concurrently(
+    pending: list[tuple[Photo, Path, str]],
+    client: AsyncOpenAI,
+    settings: Settings,
+    sleep: Callable[[float], Awaitable[None]],
+) -> dict[str, EnrichedPhoto]:
+    semaphore = asyncio.Semaphore(settings.vision_concurrency)
+
+    async def analyse(photo: Photo, photo_path: Path, cache_key: str) -> EnrichedPhoto:
+        async with semaphore:
+            return await _analyse_uncached(photo, photo_path, cache_key, client, settings, sleep)
+
+    outcomes = await asyncio.gather(
+        *(analyse(*item) for item in pending), return_exceptions=True
+    )
+
+    results: dict[str, EnrichedPhoto] = {}
+    for (photo, _, _), outcome in zip(pending, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.warning("  [%s] %s — SKIPPED: %s", photo.id, photo.filename, outcome)
+            continue
+        results[photo.id] = outcome
+    return results
+
+
+async def _analyse_uncached(
+    photo: Photo,
+    photo_path: Path,
+    cache_key: str,
+    client: AsyncOpenAI,
+    settings: Settings,
+    sleep: Callable[[float], Awaitable[None]],
+) -> EnrichedPhoto:
+    """Call the Vision API for one photo, save the processed image and cache the result."""
+    logger.debug("Cache miss for %s — calling Vision API", photo.filename)
+    api_bytes = await asyncio.to_thread(_load_api_bytes, photo_path)
+    analysis = await _call_vision_api(api_bytes, client, settings, sleep)
+    # Same processing path as batch results and cache rebuilds
+    processed_img = await asyncio.to_thread(
+        _load_for_processing, photo_path, analysis.crop_box
+    )
+    return await asyncio.to_thread(
+        _store_analysis, photo, processed_img, analysis, cache_key, settings
     )
+
+
+def _store_analysis(
+    photo: Photo,
+    processed_img: Image.Image,
+    analysis: PhotoAnalysis,
+    cache_key: str,
+    settings: Settings,
+) -> EnrichedPhoto:
+    """Save the processed image and write the per-photo cache file.
+
+    `processed_img` is final: orientation-corrected and, if the analysis has
+    a crop_box, already cropped.
+    """
+    processed_path = _save_processed(processed_img, cache_key, settings)
     result = EnrichedPhoto.from_analysis(
         photo.id, analysis, settings.vision_model, processed_path=processed_path
     )
 
-    cache_file.write_text(result.model_dump_json(indent=2), encoding="utf-8")
+    _write_atomic(settings.analyses_dir / f"{cache_key}.json", dump_model(result))
     return result
 
 
 def _save_processed(
-    photo: Photo,
-    corrected_img: Image.Image,
-    crop_box: CropBox | None,
-    content_hash: str,
+    processed_img: Image.Image,
+    cache_key: str,
     settings: Settings,
 ) -> Path:
-    """Crop and save processed image; return path relative to project_dir.
+    """Save processed image to .cache/processed/; return path relative to project_dir.
 
-    `corrected_img` has already had EXIF orientation applied.
-    For document photos with a crop_box: crop + save to .cache/processed/.
-    For all other photos: processed_path points to the original fotos/ file.
+    Document photos are saved cropped; all other photos are saved
+    orientation-corrected only, so they are always right-side-up.
     """
-    if crop_box is None:
-        # No cropping — save orientation-corrected version so it's always right-side-up
-        out_path = settings.processed_dir / f"{content_hash}.jpg"
-        corrected_img.save(out_path, format="JPEG", quality=92)
-        return out_path.relative_to(settings.project_dir)
-
-    cropped = _crop_with_margin(corrected_img, crop_box)
-    out_path = settings.processed_dir / f"{content_hash}.jpg"
-    cropped.save(out_path, format="JPEG", quality=92)
+    out_path = settings.processed_dir / f"{cache_key}.jpg"
+    processed_img.save(out_path, format="JPEG", quality=92)
     return out_path.relative_to(settings.project_dir)
 
 
-def _apply_crop_to_photo(
-    cached: EnrichedPhoto,
-    corrected_img: Image.Image,
-    content_hash: str,
-    settings: Settings,
-) -> EnrichedPhoto:
-    """Re-apply processing when the processed file is missing (cache rebuild)."""
-    img = _crop_with_margin(corrected_img, cached.crop_box) if cached.crop_box else corrected_img
-    out_path = settings.processed_dir / f"{content_hash}.jpg"
-    img.save(out_path, format="JPEG", quality=92)
-    return cached.model_copy(
-        update={"processed_path": out_path.relative_to(settings.project_dir)}
-    )
-
-
 def _crop_with_margin(img: Image.Image, crop_box: CropBox) -> Image.Image:
     """Apply crop box with margin padding. Never exceeds image bounds."""
-    w, h = img.size
+    return img.crop(_margin_box(crop_box, img.size))
+
+
+def _margin_box(crop_box: CropBox, size: tuple[int, int]) -> tuple[int, int, int, int]:
+    """Pixel box for crop_box plus margin on an image of ``size``."""
+    w, h = size
     x_min = max(0.0, crop_box.x_min - _CROP_MARGIN)
     y_min = max(0.0, crop_box.y_min - _CROP_MARGIN)
     x_max = min(1.0, crop_box.x_max + _CROP_MARGIN)
     y_max = min(1.0, crop_box.y_max + _CROP_MARGIN)
-    return img.crop((int(x_min * w), int(y_min * h), int(x_max * w), int(y_max * h)))
+    return int(x_min * w), int(y_min * h), int(x_max * w), int(y_max * h)
+
+
+def _raw_box(
+    box: tuple[int, int, int, int],
+    orientation: int,
+    raw_size: tuple[int, int],
+) -> tuple[int, int, int, int]:
+    """Map a pixel box on the orientation-corrected image back onto the raw image."""
+    left, top, right, bottom = box
+    w, h = raw_size
+    return {
+        2: (w - right, top, w - left, bottom),
+        3: (w - right, h - bottom, w - left, h - top),
+        4: (left, h - bottom, right, h - top),
+        5: (top, left, bottom, right),
+        6: (top, h - right, bottom, h - left),
+        7: (w - bottom, h - right, w - top, h - left),
+        8: (w - bottom, left, w - top, right),
+    }.get(orientation, box)
 
 
 # ---------------------------------------------------------------------------
 # Vision API call
 # ---------------------------------------------------------------------------
 
-def _call_vision_api(
+async def _call_vision_api(
     image_bytes: bytes,
-    client: OpenAI,
+    client: AsyncOpenAI,
     settings: Settings,
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
 ) -> PhotoAnalysis:
     """Call GPT Vision with exponential-backoff retry on rate limits."""
-    b64 = base64.standard_b64encode(image_bytes).decode()
-    mime = _detect_mime(image_bytes)
+    messages = _vision_messages(image_bytes)
 
     for attempt in range(_MAX_RETRIES):
         try:
-            response = client.beta.chat.completions.parse(
+            response = await client.beta.chat.completions.parse(
                 model=settings.vision_model,
-                messages=[
-                    {"role": "system", "content": _SYSTEM_PROMPT},
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:{mime};base64,{b64}",
-                                    "detail": "high",
-                                },
-                            }
-                        ],
-                    },
-                ],
+                messages=messages,
                 response_format=PhotoAnalysis,
             )
             return response.choices[0].message.parsed
@@ -235,30 +361,229 @@ def _call_vision_api(
                 "Rate limited; retrying in %.1fs (attempt %d/%d).",
                 delay, attempt + 1, _MAX_RETRIES,
             )
-            time_module.sleep(delay)
+            await sleep(delay)
 
     raise RuntimeError("Unreachable")  # pragma: no cover
 
 
+def _vision_messages(image_bytes: bytes) -> list[dict]:
+    b64 = base64.standard_b64encode(image_bytes).decode()
+    mime = _detect_mime(image_bytes)
+    return [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {
+            "role": "user",
+            "content": [
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:{mime};base64,{b64}",
+                        "detail": "high",
+                    },
+                }
+            ],
+        },
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Batch API
+# ---------------------------------------------------------------------------
+
+async def _analyse_via_batch(
+    pending: list[tuple[Photo, Path, str]],
+    client: AsyncOpenAI,
+    settings: Settings,
+    sleep: Callable[[float], Awaitable[None]],
+) -> dict[str, EnrichedPhoto]:
+    """Submit all pending photos as one Batch API job and wait for it.
+
+    Raises if the job does not complete; photos missing from the output
+    (per-request errors, refusals) are logged and left out.
+    """
+    lines: list[bytes] = []
+    for photo, photo_path, _ in pending:
+        corrected_bytes = await asyncio.to_thread(_load_api_bytes, photo_path)
+        lines.append(orjson.dumps({
+            "custom_id": photo.id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": settings.vision_model,
+                "messages": _vision_messages(corrected_bytes),
+                "response_format": _batch_response_format(),
+            },
+        }))
+
+    input_file = await client.files.create(
+        file=("batch_requests.jsonl", b"\n".join(lines)),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    logger.info("Submitted Vision batch %s (%d photos).", batch.id, len(pending))
+
+    delay = _BATCH_POLL_INITIAL
+    while batch.status not in _BATCH_TERMINAL_STATUSES:
+        await sleep(delay)
+        delay = min(delay * 2, _BATCH_POLL_MAX)
+        batch = await client.batches.retrieve(batch.id)
+        logger.debug("Batch %s status: %s", batch.id, batch.status)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"batch {batch.id} ended with status {batch.status!r}")
+
+    output = await client.files.content(batch.output_file_id)
+    analyses = _parse_batch_output(output.text)
+
+    results: dict[str, EnrichedPhoto] = {}
+    for photo, photo_path, cache_key in pending:
+        analysis = analyses.get(photo.id)
+        if analysis is None:
+            logger.warning("  [%s] %s — SKIPPED: no batch result", photo.id, photo.filename)
+            continue
+        try:
+            processed_img = await asyncio.to_thread(
+                _load_for_processing, photo_path, analysis.crop_box
+            )
+            results[photo.id] = await asyncio.to_thread(
+                _store_analysis, photo, processed_img, analysis, cache_key, settings
+            )
+        except Exception as exc:
+            logger.warning("  [%s] %s — SKIPPED: %s", photo.id, photo.filename, exc)
+    return results
+
+
+@functools.cache
+def _batch_response_format() -> dict:
+    # PhotoAnalysis's json_schema_extra hook already makes the schema strict-mode compliant.
+    # Built once: every request line of a batch embeds the same (read-only) schema.
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": PhotoAnalysis.__name__,
+            "schema": PhotoAnalysis.model_json_schema(),
+            "strict": True,
+        },
+    }
+
+
+def _parse_batch_output(text: str) -> dict[str, PhotoAnalysis]:
+    """Map custom_id → PhotoAnalysis for every successful line of a batch output file."""
+    analyses: dict[str, PhotoAnalysis] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = orjson.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            logger.debug("Batch request %s failed: %s", record.get("custom_id"), record.get("error"))
+            continue
+        content = response["body"]["choices"][0]["message"].get("content")
+        if content:
+            analyses[record["custom_id"]] = PhotoAnalysis.model_validate_json(content)
+    return analyses
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _load_corrected(path: Path) -> tuple[Image.Image, bytes]:
-    """Open image, apply EXIF orientation, return (PIL Image, JPEG bytes).
+def _cache_key(
+    image_bytes: bytes,
+    model: str,
+    prompt_ver: str = _PROMPT_VERSION,
+    schema_ver: str = _SCHEMA_VERSION,
+) -> str:
+    """BLAKE3 hex key for an analysis of ``image_bytes`` by ``model``."""
+    digest = _key_digest(model, prompt_ver, schema_ver)
+    digest.update(image_bytes)
+    return digest.hexdigest()
+
+
+def _file_cache_key(path: Path, model: str) -> str:
+    """Same key as _cache_key(path.read_bytes(), model), hashed from a memory map.
 
-    ImageOps.exif_transpose() ensures the image is right-side-up before it
-    is sent to the Vision API or used for cropping. The returned Image is a
-    fully-loaded copy (not backed by a file handle) so the caller need not
-    manage a context manager.
+    The file is never copied into a Python bytes object; on a cache hit the
+    photo is not read any further than the hash needs.
     """
-    import io
+    digest = _key_digest(model, _PROMPT_VERSION, _SCHEMA_VERSION)
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                digest.update(mm)
+        except ValueError:
+            pass  # empty file — cannot be mapped, contributes no bytes
+    return digest.hexdigest()
+
+
+def _key_digest(model: str, prompt_ver: str, schema_ver: str):
+    prefix = b"|".join([model.encode(), prompt_ver.encode(), schema_ver.encode()]) + b"|"
+    return blake3(prefix, max_threads=blake3.AUTO)
+
+
+def _write_artifact(photo_set: EnrichedPhotoSet, settings: Settings) -> Path:
+    """Write enriched_photos.json unless it already holds exactly this content."""
+    artifact_path = settings.cache_dir / "enriched_photos.json"
+    write_if_changed(artifact_path, dump_model(photo_set))
+    return artifact_path
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file + os.replace so readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _load_api_bytes(path: Path) -> bytes:
+    """Vision API bytes only, decoding no more pixels than the upload needs."""
     with Image.open(path) as img:
+        img.draft("RGB", (_API_MAX_EDGE, _API_MAX_EDGE))
         corrected = ImageOps.exif_transpose(img)
-        corrected = corrected.copy()  # detach from file handle before closing
+    return _api_bytes(corrected)
+
+
+def _api_bytes(img: Image.Image) -> bytes:
+    """JPEG bytes for the Vision API, downscaled to at most _API_MAX_EDGE."""
+    import io
+    if max(img.size) > _API_MAX_EDGE:
+        img = img.copy()
+        img.thumbnail((_API_MAX_EDGE, _API_MAX_EDGE), Image.Resampling.LANCZOS)
     buf = io.BytesIO()
-    corrected.save(buf, format="JPEG", quality=92)
-    return corrected, buf.getvalue()
+    img.save(buf, format="JPEG", quality=92)
+    return buf.getvalue()
+
+
+def _load_for_processing(path: Path, crop_box: CropBox | None = None) -> Image.Image:
+    """Open image with EXIF orientation applied (and crop_box, if given) for saving.
+
+    The single source of processed images, for fresh analyses and cache
+    rebuilds alike. Lets libjpeg decode at a reduced DCT scale (Image.draft)
+    for very large photos. A crop is taken from the raw pixels first, so only
+    the cropped region is rotated — same result as _crop_with_margin on the
+    transposed image.
+    """
+    with Image.open(path) as img:
+        img.draft("RGB", (_PROCESSED_MIN_EDGE, _PROCESSED_MIN_EDGE))
+        if crop_box is None:
+            corrected = ImageOps.exif_transpose(img)
+            return corrected.copy()  # detach from file handle before closing
+
+        orientation = img.getexif().get(ExifTags.Base.Orientation, 1)
+        corrected_size = img.size[::-1] if orientation in (5, 6, 7, 8) else img.size
+        box = _raw_box(_margin_box(crop_box, corrected_size), orientation, img.size)
+        cropped = img.crop(box)
+    method = _EXIF_TRANSPOSE.get(orientation)
+    return cropped.transpose(method) if method is not None else cropped
 
 
 def _detect_mime(image_bytes: bytes) -> str:
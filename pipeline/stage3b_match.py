@@ -14,14 +14,20 @@ Reads:  data/.cache/manifest.json        (ProjectManifest)
 Writes: data/.cache/content_plan.json    (ContentPlan)
 """
 import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import time
+from itertools import repeat
 from statistics import mean
 
+import numpy as np
+
 from models.content_plan import ContentItem, ContentPlan
 from models.enriched_photos import EnrichedPhoto, EnrichedPhotoSet
 from models.manifest import AgendaSession, Photo, ProjectManifest, TextSnippet
 from settings import Settings
+from utils.json_utils import dump_model, write_if_changed
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +39,14 @@ _DEFAULT_THRESHOLD = 0.65
 # always belongs to the workshop regardless of topic match.
 _SEMANTIC_FLOOR = 0.1
 
+# Below this many photo×session pairs semantic scoring runs in-process;
+# above it, photos are sharded across a process pool.
+_PARALLEL_MIN_PAIRS = 10_000
+
+# Letter-only words of length >= 2 (any script, so umlauts/ß/accents included);
+# word boundaries keep mixed tokens such as "KW12" out, as before.
+_TOKEN_RE = re.compile(r'\b[^\W\d_]{2,}\b')
+
 
 def run(
     settings: Settings,
@@ -53,16 +67,26 @@ def run(
         _write_artifact(plan, settings)
         return plan
 
+    # Tokenize every text source once; pair scoring below only does set ops.
+    snippet_words = _snippet_tokens(manifest.text_snippets)
+    session_words = [_tokenize(s.name) | snippet_words for s in sessions]
+    photo_words = [
+        _photo_tokens(enriched_map[p.id]) if p.id in enriched_map else None
+        for p in photos
+    ]
+
+    # Temporal scores for all pairs in one vectorized pass
+    temporal = _temporal_matrix(photos, sessions).tolist()
+    semantic = _semantic_matrix(photo_words, session_words)
+
     # Build per-photo scores: {photo_id: {session_id: (temporal, semantic)}}
-    photo_scores: dict[str, dict[str, tuple[float, float]]] = {}
-    for photo in photos:
-        enriched = enriched_map.get(photo.id)
-        scores: dict[str, tuple[float, float]] = {}
-        for session in sessions:
-            t = _temporal_score(photo, session, sessions)
-            s = _semantic_score(enriched, session, manifest.text_snippets)
-            scores[session.id] = (t, s)
-        photo_scores[photo.id] = scores
+    photo_scores: dict[str, dict[str, tuple[float, float]]] = {
+        photo.id: {
+            session.id: (t, s)
+            for session, t, s in zip(sessions, temporal_row, semantic_row)
+        }
+        for photo, temporal_row, semantic_row in zip(photos, temporal, semantic)
+    }
 
     # Assign each photo to its best session
     assignments: dict[str, list[str]] = {s.id: [] for s in sessions}
@@ -131,60 +155,83 @@ def _temporal_score(
     - 1.0  timestamp falls inside the session window
     - 0.5  no timestamp or no session times — neutral / equal distribution
     - 0.0  timestamp clearly belongs to a different session's window
-    """
-    ts = photo.best_timestamp
-    if ts is None:
-        return 0.5
-
-    # Strip tzinfo: datetime.time objects are always naive (no tz support),
-    # and session start/end times are also naive — comparison requires both be naive.
-    photo_time = ts.time().replace(tzinfo=None)
 
-    # Check if any session has time data at all
-    sessions_with_times = [s for s in all_sessions if s.start_time is not None]
-    if not sessions_with_times:
+    Scalar view of _temporal_matrix, which run() uses for all pairs at once.
+    """
+    sessions = list(all_sessions)
+    col = next((j for j, s in enumerate(sessions) if s is session), None)
+    if col is None:
+        sessions.append(session)
+        col = len(sessions) - 1
+    return float(_temporal_matrix([photo], sessions)[0, col])
+
+
+def _temporal_matrix(
+    photos: list[Photo],
+    sessions: list[AgendaSession],
+) -> np.ndarray:
+    """Temporal scores for every (photo, session) pair as a P×S array.
+
+    Photo and session times are compared as wall-clock seconds of day (photo
+    tzinfo is ignored, session times are naive). Inside the window scores 1.0;
+    outside, the score decays linearly to 0.0 over 30 minutes of distance to
+    the nearer window edge, measured in whole minutes.
+    """
+    scores = np.full((len(photos), len(sessions)), 0.5)
+    windows = _session_windows(sessions)
+    if all(w is None for w in windows):
         # No temporal info anywhere — distribute evenly
-        return 0.5
-
-    if session.start_time is None:
-        # This session has no times but others do — lowest priority for time-stamped photos
-        return 0.1
-
-    start = session.start_time
-
-    # Determine effective end: next session's start, or +90 min if last session
-    end = session.end_time
-    if end is None:
-        next_sessions = [
-            s for s in all_sessions
-            if s.order > session.order and s.start_time is not None
-        ]
-        if next_sessions:
-            end = min(next_sessions, key=lambda s: s.order).start_time
-        else:
-            # Last session — open-ended, grant 90 minutes
-            end = _add_minutes(start, 90)
-
-    if _time_in_window(photo_time, start, end):
-        return 1.0
-
-    # Outside window — score by proximity (decay over 30 minutes)
-    dist_minutes = _minutes_distance(photo_time, start, end)
-    return max(0.0, 1.0 - dist_minutes / 30.0)
+        return scores
+
+    photo_secs = np.array(
+        [p.ts_seconds_of_day for p in photos], dtype=np.float64,  # None → NaN
+    )[:, None]
+    starts = np.array([w[0] if w else np.nan for w in windows], dtype=np.float64)
+    ends = np.array([w[1] if w else np.nan for w in windows], dtype=np.float64)
+
+    in_window = (photo_secs >= starts) & (photo_secs <= ends)
+    photo_mins = np.floor(photo_secs / 60)
+    dist_minutes = np.minimum(
+        np.abs(photo_mins - np.floor(starts / 60)),
+        np.abs(photo_mins - np.floor(ends / 60)),
+    )
+    scores = np.where(in_window, 1.0, np.maximum(0.0, 1.0 - dist_minutes / 30.0))
 
+    # Untimed session while others have times — lowest priority for time-stamped photos
+    scores[:, np.isnan(starts)] = 0.1
+    # Photo without timestamp — neutral
+    scores[np.isnan(photo_secs[:, 0]), :] = 0.5
+    return scores
 
-def _time_in_window(t: time, start: time, end: time) -> bool:
-    return start <= t <= end
 
+def _session_windows(sessions: list[AgendaSession]) -> list[tuple[float, float] | None]:
+    """Effective (start, end) seconds of day per session; None if untimed.
 
-def _minutes_distance(t: time, start: time, end: time) -> float:
-    """Minutes outside the window [start, end]. 0 if inside."""
-    t_mins = t.hour * 60 + t.minute
-    s_mins = start.hour * 60 + start.minute
-    e_mins = end.hour * 60 + end.minute
-    if s_mins <= t_mins <= e_mins:
-        return 0.0
-    return min(abs(t_mins - s_mins), abs(t_mins - e_mins))
+    A missing end is the next timed session's start, or +90 min for the last one.
+    """
+    windows: list[tuple[float, float] | None] = []
+    for session in sessions:
+        start = session.start_time
+        if start is None:
+            windows.append(None)
+            continue
+        end = session.end_time
+        if end is None:
+            next_sessions = [
+                s for s in sessions
+                if s.order > session.order and s.start_time is not None
+            ]
+            if next_sessions:
+                end = min(next_sessions, key=lambda s: s.order).start_time
+            else:
+                # Last session — open-ended, grant 90 minutes
+                end = _add_minutes(start, 90)
+        windows.append((_seconds_of_day(start), _seconds_of_day(end)))
+    return windows
+
+
+def _seconds_of_day(t: time) -> float:
+    return t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
 
 
 def _add_minutes(t: time, minutes: int) -> time:
@@ -209,20 +256,56 @@ def _semantic_score(
     """
     if enriched is None:
         return _SEMANTIC_FLOOR
+    session_words = _tokenize(session.name) | _snippet_tokens(text_snippets)
+    return _jaccard_score(_photo_tokens(enriched), session_words)
+
+
+def _semantic_matrix(
+    photo_words: list[set[str] | None],
+    session_words: list[set[str]],
+) -> list[list[float]]:
+    """Jaccard scores for every (photo, session) pair, one row per photo.
+
+    Large projects are split into per-core photo chunks and scored in a
+    process pool; below _PARALLEL_MIN_PAIRS pairs the pool start-up costs
+    more than it saves, so scoring stays in-process.
+    """
+    workers = min(os.cpu_count() or 1, len(photo_words))
+    if workers < 2 or len(photo_words) * len(session_words) < _PARALLEL_MIN_PAIRS:
+        return _semantic_rows(photo_words, session_words)
+
+    size = -(-len(photo_words) // workers)  # ceil division
+    chunks = [photo_words[i:i + size] for i in range(0, len(photo_words), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_semantic_rows, chunks, repeat(session_words))
+        return [row for part in parts for row in part]
+
 
-    # Photo word set: keywords + OCR text + description
-    photo_words = _tokenize(
+def _semantic_rows(
+    photo_words: list[set[str] | None],
+    session_words: list[set[str]],
+) -> list[list[float]]:
+    return [[_jaccard_score(pw, sw) for sw in session_words] for pw in photo_words]
+
+
+def _photo_tokens(enriched: EnrichedPhoto) -> set[str]:
+    """Photo word set: keywords + OCR text + description."""
+    return _tokenize(
         " ".join(enriched.topic_keywords)
         + " " + (enriched.ocr_text or "")
         + " " + enriched.description
     )
 
-    # Session word set: name + related text snippets
-    snippet_text = " ".join(
-        snip.content for snip in text_snippets
-    )
-    session_words = _tokenize(session.name + " " + snippet_text)
 
+def _snippet_tokens(text_snippets: list[TextSnippet]) -> frozenset[str]:
+    return frozenset().union(*(_tokenize(snip.content) for snip in text_snippets))
+
+
+def _jaccard_score(photo_words: set[str] | None, session_words: set[str]) -> float:
+    """Jaccard similarity of pre-tokenized word sets, floored at _SEMANTIC_FLOOR.
+
+    ``photo_words`` is None for photos without an enrichment result.
+    """
     if not photo_words or not session_words:
         return _SEMANTIC_FLOOR
 
@@ -239,8 +322,7 @@ def _tokenize(text: str) -> set[str]:
     Minimum length 2 preserves meaningful German abbreviations common in
     workshop documentation (OGS, KL, SL, TS, etc.).
     """
-    words = re.findall(r'\b[a-zäöüßA-ZÄÖÜ]{2,}\b', text.lower())
-    return set(words)
+    return set(_TOKEN_RE.findall(text.lower()))
 
 
 # ---------------------------------------------------------------------------
@@ -269,6 +351,6 @@ def _find_text_snippet(
 
 
 def _write_artifact(plan: ContentPlan, settings: Settings) -> None:
+    """Write content_plan.json unless it already holds exactly this content."""
     settings.cache_dir.mkdir(parents=True, exist_ok=True)
-    artifact_path = settings.cache_dir / "content_plan.json"
-    artifact_path.write_text(plan.model_dump_json(indent=2), encoding="utf-8")
+    write_if_changed(settings.cache_dir / "content_plan.json", dump_model(plan))
@@ -27,6 +27,7 @@ from models.enriched_photos import EnrichedPhoto, EnrichedPhotoSet
 from models.manifest import Photo, ProjectManifest, TextSnippet
 from models.page_plan import Page, PagePlan, PhotoSlot, TextBlock
 from settings import Settings
+from utils.json_utils import dump_model
 
 # Approximate words per text-only page (body font ~10pt, A4 with margins)
 _WORDS_PER_TEXT_PAGE = 400
@@ -50,10 +51,13 @@ def run(
     manifest: ProjectManifest,
     content_plan: ContentPlan,
     photo_set: EnrichedPhotoSet,
+    *,
+    write_artifact: bool = True,
 ) -> PagePlan:
     """Build the PagePlan and write page_plan.json.
 
-    Returns the completed PagePlan.
+    Returns the completed PagePlan. With ``write_artifact=False`` nothing is
+    written to the cache (for callers that only need the returned plan).
     """
     enriched_map = {e.photo_id: e for e in photo_set.enriched_photos}
     # Orientation from manifest (computed from EXIF in Stage 1, always authoritative)
@@ -113,11 +117,13 @@ def run(
 
     plan = PagePlan(pages=pages)
 
-    artifact_path = settings.cache_dir / "page_plan.json"
-    settings.cache_dir.mkdir(parents=True, exist_ok=True)
-    artifact_path.write_text(plan.model_dump_json(indent=2), encoding="utf-8")
-
-    logger.info("Stage 4 complete → %s", artifact_path)
+    if write_artifact:
+        artifact_path = settings.cache_dir / "page_plan.json"
+        settings.cache_dir.mkdir(parents=True, exist_ok=True)
+        artifact_path.write_bytes(dump_model(plan))
+        logger.info("Stage 4 complete → %s", artifact_path)
+    else:
+        logger.info("Stage 4 complete")
     logger.info("  Total pages: %d", len(pages))
     _log_page_summary(pages)
 
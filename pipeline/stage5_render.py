@@ -9,8 +9,12 @@ Photo images are embedded as ``file://`` URIs resolved from
 ``processed_path`` (relative to ``project_dir``).  When ``processed_path``
 is absent the original photo in ``fotos/`` is used as a fallback.
 """
+import functools
 import logging
+import mmap
+import os
 import re
+import unicodedata
 import zlib
 from pathlib import Path
 
@@ -35,6 +39,32 @@ logger = logging.getLogger(__name__)
 _TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
 
 
+def _nfc_finalize(value):
+    """Emit every template string in NFC, so WeasyPrint shapes precomposed glyphs.
+
+    Text from macOS file systems often arrives decomposed (u + U+0308); NFC
+    collapses it to one code point. ASCII and already-normalized strings pass
+    through untouched, and Markup stays Markup (markdown filter output).
+    """
+    if isinstance(value, str) and not value.isascii() and not unicodedata.is_normalized("NFC", value):
+        normalized = unicodedata.normalize("NFC", value)
+        return Markup(normalized) if isinstance(value, Markup) else normalized
+    return value
+
+
+# One environment per process: Jinja2 caches compiled templates per
+# environment, so report.html.j2 is parsed and compiled only once.
+_ENV = Environment(
+    loader=FileSystemLoader(str(_TEMPLATE_DIR)),
+    autoescape=select_autoescape(["html"]),
+    finalize=_nfc_finalize,
+    auto_reload=False,  # templates ship with the package; skip the mtime check per lookup
+)
+_ENV.filters["markdown"] = lambda text: Markup(
+    _markdown_lib.markdown(text, extensions=["extra"])
+)
+
+
 def run(
     settings: Settings,
     page_plan: PagePlan,
@@ -63,11 +93,7 @@ def run(
             "WeasyPrint native libraries (GTK/Pango) are not available. "
             "Follow https://doc.courtbouillon.org/weasyprint/stable/first_steps.html"
         )
-    font_config = _weasyprint.text.fonts.FontConfiguration()
-    font_css = _weasyprint.CSS(
-        string=_build_font_face_css(design.typography.body.font),
-        font_config=font_config,
-    )
+    font_config, font_css = _font_resources(design.typography.body.font)
     _weasyprint.HTML(
         string=html,
         base_url=str(settings.project_dir.resolve()),
@@ -91,17 +117,11 @@ def _render_html(
     manifest: ProjectManifest | None = None,
 ) -> str:
     """Render the Jinja2 template to an HTML string."""
-    env = Environment(
-        loader=FileSystemLoader(str(_TEMPLATE_DIR)),
-        autoescape=select_autoescape(["html"]),
-    )
-    env.filters["markdown"] = lambda text: Markup(
-        _markdown_lib.markdown(text, extensions=["extra"])
-    )
-    template = env.get_template("report.html.j2")
+    template = _ENV.get_template("report.html.j2")
     return template.render(
         pages=page_plan.pages,
         ds=design,
+        css=_css_for_design(design.model_dump_json()),
         photo_srcs=photo_srcs,
         logo_src=logo_src,
         footer_logo_src=footer_logo_src,
@@ -109,6 +129,17 @@ def _render_html(
     )
 
 
+@functools.lru_cache(maxsize=8)
+def _css_for_design(design_json: str) -> str:
+    """Render the report stylesheet for a serialized DesignSystem.
+
+    The CSS depends only on the design, so repeated renders with the same
+    design reuse the cached string instead of re-rendering report.css.j2.
+    """
+    design = DesignSystem.model_validate_json(design_json)
+    return _ENV.get_template("report.css.j2").render(ds=design)
+
+
 # ---------------------------------------------------------------------------
 # Font embedding
 # ---------------------------------------------------------------------------
@@ -132,6 +163,21 @@ _FONT_STYLE_MAP = {
 }
 
 
+@functools.lru_cache(maxsize=4)
+def _font_resources(font_name: str) -> tuple:
+    """Return the WeasyPrint ``(FontConfiguration, CSS)`` embedding ``font_name``.
+
+    Cached per font: the font directory scan, @font-face parsing and font
+    registration happen once per process instead of on every render.
+    """
+    font_config = _weasyprint.text.fonts.FontConfiguration()
+    font_css = _weasyprint.CSS(
+        string=_build_font_face_css(font_name),
+        font_config=font_config,
+    )
+    return font_config, font_css
+
+
 def _find_font_files(font_name: str) -> list[tuple[Path, str, str]]:
     """Scan font directories for TTF/OTF files matching ``font_name``.
 
@@ -193,37 +239,58 @@ def _build_font_face_css(font_name: str) -> str:
 # PDF font validation
 # ---------------------------------------------------------------------------
 
+# Object stream headers: the dictionary end and the start of the stream data
+_PDF_OBJSTM_RE = re.compile(rb"/Type\s*/ObjStm\b.{0,512}?>>\s*stream\r?\n", re.DOTALL)
+# /FontFile2 or /FontFile3 references (TrueType / OpenType programs)
+_PDF_FONT_FILE_RE = re.compile(rb"/FontFile[23]?\b")
+# Subset font names (standard PDF format: ABCDEF+FontName)
+_PDF_SUBSET_NAME_RE = re.compile(rb"/FontName\s+/([A-Z]{6}\+[^\s/\]>]+)")
+
+
 def _validate_pdf_fonts(pdf_path: Path, expected_font: str) -> None:
     """Check that fonts are embedded in the generated PDF and log the result.
 
-    Parses the raw PDF bytes looking for:
-    - ``/FontFile2`` (TrueType font programs) in object-stream dictionaries
+    Scans the memory-mapped PDF bytes looking for:
+    - ``/FontFile2`` (TrueType font programs) in raw and object-stream dictionaries
     - Subset font names with the standard ``ABCDEF+FontName`` prefix
 
     A warning is logged if no embedded font programs are found so the caller
     can catch misconfiguration early without aborting the run.
     """
-    data = pdf_path.read_bytes()
-
-    # Decompress all FlateDecode streams so we can inspect object dictionaries
-    # that WeasyPrint packs into cross-reference object streams (ObjStm).
-    all_decoded: list[bytes] = [data]  # also search raw (uncompressed objects)
-    for m in re.finditer(rb"stream[\r\n]+(.*?)[\r\n]+endstream", data, re.DOTALL):
-        try:
-            all_decoded.append(zlib.decompress(m.group(1)))
-        except Exception:
-            pass
-
-    combined = b"\n".join(all_decoded)
-
-    # Count /FontFile2 or /FontFile3 references (TrueType / OpenType programs)
-    font_file_refs = len(re.findall(rb"/FontFile[23]?\b", combined))
+    font_file_refs = 0
+    subset_names: list[str] = []
+
+    def scan(buf) -> None:
+        nonlocal font_file_refs
+        font_file_refs += sum(1 for _ in _PDF_FONT_FILE_RE.finditer(buf))
+        subset_names.extend(
+            m.group(1).decode("latin-1") for m in _PDF_SUBSET_NAME_RE.finditer(buf)
+        )
 
-    # Collect subset font names (standard PDF format: ABCDEF+FontName)
-    subset_names = [
-        n.decode("latin-1")
-        for n in re.findall(rb"/FontName\s+/([A-Z]{6}\+[^\s/\]>]+)", combined)
-    ]
+    # Map the file instead of reading it: the regexes scan the mapping in
+    # place, so only decompressed streams are held in memory (one at a time).
+    with open(pdf_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                scan(mm)  # raw search covers uncompressed objects
+                # Inflate only the object streams (ObjStm) WeasyPrint packs
+                # font descriptors into. pydyf puts every compressible object
+                # into one stream with the descriptors near the end, so each
+                # is inflated in full; font, image and content streams are
+                # never decompressed.
+                with memoryview(mm) as view:
+                    for m in _PDF_OBJSTM_RE.finditer(mm):
+                        start = m.end()
+                        end = mm.find(b"endstream", start)
+                        if end == -1:
+                            end = len(mm)
+                        chunk = view[start:end]
+                        try:
+                            scan(zlib.decompressobj().decompress(chunk))
+                        except zlib.error:
+                            pass
+                        finally:
+                            chunk.release()
 
     if font_file_refs == 0 and not subset_names:
         logger.warning(
@@ -255,18 +322,26 @@ def _build_photo_srcs(
     settings: Settings,
 ) -> dict[str, str]:
     """Map photo_id → ``file://`` URI for the processed (or original) image."""
+    # Resolve the project root once; every candidate is built beneath it, so
+    # the per-photo paths are already absolute and need no resolve() of their own.
+    root = settings.project_dir.resolve()
+    if root != settings.project_dir:
+        settings = settings.model_copy(update={"project_dir": root})
     # Build a fallback map: photo_id → original path from the manifest
     manifest_paths: dict[str, Path] = {
-        p.id: settings.project_dir / p.path
+        p.id: root / p.path
         for p in manifest.photos
     }
+    # Existence is checked against one directory listing per folder
+    # instead of an exists() call per candidate.
+    listings: dict[Path, frozenset[str]] = {}
     result: dict[str, str] = {}
     for ep in photo_set.enriched_photos:
         path = _resolve_photo_path(
-            ep.processed_path, ep.photo_id, manifest_paths, settings
+            ep.processed_path, ep.photo_id, manifest_paths, settings, listings
         )
-        if path and path.exists():
-            result[ep.photo_id] = path.resolve().as_uri()
+        if path is not None:
+            result[ep.photo_id] = path.as_uri()
     return result
 
 
@@ -275,27 +350,49 @@ def _resolve_photo_path(
     photo_id: str,
     manifest_paths: dict[str, Path],
     settings: Settings,
+    listings: dict[Path, frozenset[str]] | None = None,
 ) -> Path | None:
     """Return the absolute Path for a photo.
 
     Priority:
     1. ``processed_path`` (relative to project_dir) — cropped/corrected image
     2. Manifest original path — exact filename from Stage 1 ingest
+
+    ``listings`` caches directory contents across calls; without it each
+    candidate is checked with ``Path.exists()``.
     """
     if processed_path:
         candidate = settings.project_dir / processed_path
-        if candidate.exists():
+        if _file_exists(candidate, listings):
             return candidate
 
     # Fallback: manifest original path (has the real filename)
     if photo_id in manifest_paths:
         candidate = manifest_paths[photo_id]
-        if candidate.exists():
+        if _file_exists(candidate, listings):
             return candidate
 
     return None
 
 
+def _file_exists(path: Path, listings: dict[Path, frozenset[str]] | None) -> bool:
+    """Check *path* against a cached listing of its parent directory.
+
+    The listing only answers exact-name hits; a miss falls back to
+    ``Path.exists()``, which honours case-insensitive file systems.
+    """
+    if listings is None:
+        return path.exists()
+    parent = path.parent
+    if parent not in listings:
+        try:
+            with os.scandir(parent) as entries:
+                listings[parent] = frozenset(e.name for e in entries)
+        except OSError:
+            listings[parent] = frozenset()
+    return path.name in listings[parent] or path.exists()
+
+
 def _find_assets_logo(settings: Settings) -> str | None:
     """Return a ``file://`` URI for the first logo found in the assets directory.
 
@@ -337,11 +434,23 @@ def _output_path(settings: Settings, manifest: ProjectManifest) -> Path:
     return settings.output_dir / filename
 
 
+_SLUG_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_SLUG_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+
 def _slugify(text: str) -> str:
-    """Convert a title to a safe ASCII filename slug."""
+    """Convert a title to a safe ASCII filename slug.
+
+    German umlauts and ß are transliterated (ü → ue); other accented letters
+    are folded to their base letter via NFKD (é → e, ř → r).
+    """
+    if text.isascii() and text.isalnum():
+        return text.lower()[:50]  # already a slug apart from case
     text = text.lower()
-    for umlaut, replacement in (("ä", "ae"), ("ö", "oe"), ("ü", "ue"), ("ß", "ss")):
-        text = text.replace(umlaut, replacement)
-    text = re.sub(r"[^a-z0-9]+", "_", text)
+    if not text.isascii():
+        # NFC first so decomposed umlauts (macOS file names) hit the German map
+        text = unicodedata.normalize("NFC", text).translate(_SLUG_UMLAUTS)
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = _SLUG_SEPARATOR_RE.sub("_", text)
     text = text.strip("_")
     return text[:50] or "protokoll"
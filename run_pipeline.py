@@ -7,7 +7,6 @@ Usage:
     python run_pipeline.py --from-stage 5   # start from stage 5 (load earlier caches)
 """
 import argparse
-import json
 import logging
 import sys
 from pathlib import Path
@@ -20,6 +19,7 @@ from models.enriched_photos import EnrichedPhotoSet
 from models.content_plan import ContentPlan
 from models.page_plan import PagePlan
 from pipeline import stage1_ingest, stage3a_enrich, stage3b_match, stage4_layout, stage5_render
+from utils.json_utils import load_model
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,8 +30,7 @@ logger = logging.getLogger("run_pipeline")
 
 
 def _load_json(path: Path, model):
-    data = json.loads(path.read_text(encoding="utf-8"))
-    return model.model_validate(data)
+    return load_model(model, path.read_bytes())
 
 
 def main() -> None:
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from pydantic import field_validator
+from pydantic import ValidationInfo, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,6 +11,9 @@ class Settings(BaseSettings):
     vision_model: str = "gpt-5"
     text_model: str = "gpt-5"        # For document parsing, heading generation, etc.
     embedding_model: str = "text-embedding-3-small"
+    vision_concurrency: int = 8      # Max Vision API requests in flight (Stage 3a)
+    vision_use_batch_api: bool = False   # Use the Batch API for large uncached photo sets
+    vision_batch_threshold: int = 32     # Min uncached photos before the Batch API is used
 
     project_dir: Path = Path("./data")
     match_confidence_threshold: float = 0.65
@@ -41,6 +44,13 @@ class Settings(BaseSettings):
             raise ValueError("max_photos_per_page must be at least 1")
         return v
 
+    @field_validator("vision_concurrency", "vision_batch_threshold")
+    @classmethod
+    def vision_limits_must_be_positive(cls, v: int, info: ValidationInfo) -> int:
+        if v < 1:
+            raise ValueError(f"{info.field_name} must be at least 1")
+        return v
+
     @property
     def agenda_dir(self) -> Path:
         return self.project_dir / "agenda"
@@ -2,11 +2,31 @@ from pathlib import Path
 
 import pytest
 
+from helpers import adapter
+from models.content_plan import ContentItem, ContentPlan
+from models.enriched_photos import EnrichedPhoto, EnrichedPhotoSet, PhotoAnalysis
+from models.events import PipelineEvent
+from models.manifest import AgendaSession, Photo, ProjectManifest, TextSnippet, WorkshopMeta
+from models.page_plan import PagePlan
 from settings import Settings
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures"
 SAMPLE_PROJECT_DIR = FIXTURES_DIR / "sample_project"
 
+# Stage contract models whose validators are built eagerly at session start
+MODEL_CLASSES = (
+    WorkshopMeta, AgendaSession, Photo, TextSnippet, ProjectManifest,
+    PhotoAnalysis, EnrichedPhoto, EnrichedPhotoSet,
+    ContentItem, ContentPlan, PagePlan, PipelineEvent,
+)
+
+
+def pytest_configure(config):
+    # Build schemas up front so each (xdist) worker pays for it once, before
+    # any test is timed, rather than inside the first round-trip test.
+    for cls in MODEL_CLASSES:
+        adapter(cls)
+
 
 @pytest.fixture
 def sample_project_dir() -> Path:
@@ -23,6 +43,13 @@ def settings(sample_project_dir: Path) -> Settings:
     )
 
 
+@pytest.fixture(scope="session")
+def base_settings() -> Settings:
+    """Validated once per session; derive per-test copies with
+    ``base_settings.model_copy(update={"project_dir": tmp_path})``."""
+    return Settings(openai_api_key="test", project_dir=Path("/nonexistent"))
+
+
 @pytest.fixture
 def tmp_settings(tmp_path: Path) -> Settings:
     """Settings instance pointing at a fresh temp directory for tests that write output.
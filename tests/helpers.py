@@ -0,0 +1,29 @@
+"""Plain helper functions shared by the test modules."""
+import functools
+import io
+
+from pydantic import TypeAdapter
+
+from settings import Settings
+
+
+@functools.cache
+def adapter(cls: type) -> TypeAdapter:
+    """One TypeAdapter per model class, shared by all tests in this process."""
+    return TypeAdapter(cls)
+
+
+@functools.lru_cache(maxsize=8)
+def jpeg_bytes(width: int, height: int) -> bytes:
+    """A blank RGB JPEG of the given size, encoded once per size."""
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def fast_settings(**overrides) -> Settings:
+    """Settings built without validation or env/.env lookup, for tests whose
+    inputs are known-good. Unspecified fields take their declared defaults."""
+    return Settings.model_construct(openai_api_key="test", **overrides)
@@ -1,11 +1,13 @@
 """Round-trip and validation tests for all stage contract models."""
 
-from datetime import date, datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
 from pydantic import ValidationError
 
+from helpers import adapter
 from models.content_plan import ContentItem, ContentPlan, _TEMPORAL_WEIGHT, _SEMANTIC_WEIGHT
 from models.enriched_photos import EnrichedPhoto, EnrichedPhotoSet, PhotoAnalysis
 from models.events import PipelineEvent
@@ -19,8 +21,8 @@ from models.page_plan import Page, PagePlan, PhotoSlot, TextBlock
 
 def round_trip(model_instance):
     """Serialize to JSON and deserialize back; return the reconstructed instance."""
-    json_str = model_instance.model_dump_json()
-    return type(model_instance).model_validate_json(json_str)
+    ta = adapter(type(model_instance))
+    return ta.validate_json(ta.dump_json(model_instance))
 
 
 # ---------------------------------------------------------------------------
@@ -69,18 +71,25 @@ class TestAgendaSession:
 # Photo — timezone handling and path storage
 # ---------------------------------------------------------------------------
 
+# Built once: Pydantic passes an existing Path instance through unchanged,
+# so fixtures don't re-parse the string on every _make_photo() call.
+# (PurePosixPath is rejected by Pydantic's Path validator.)
+_PHOTO_PATH = Path("fotos/IMG_001.jpg")  # relative path
+
+_PHOTO_DEFAULTS = MappingProxyType(dict(
+    id="photo_001",
+    filename="IMG_001.jpg",
+    path=_PHOTO_PATH,
+    timestamp_file=datetime(2026, 2, 9, 9, 0, 0, tzinfo=timezone.utc),
+    width=4032,
+    height=3024,
+    orientation="landscape",
+))
+
+
 class TestPhoto:
     def _make_photo(self, **kwargs):
-        defaults = dict(
-            id="photo_001",
-            filename="IMG_001.jpg",
-            path=Path("fotos/IMG_001.jpg"),  # relative path
-            timestamp_file=datetime(2026, 2, 9, 9, 0, 0, tzinfo=timezone.utc),
-            width=4032,
-            height=3024,
-            orientation="landscape",
-        )
-        return Photo(**{**defaults, **kwargs})
+        return Photo.model_validate({**_PHOTO_DEFAULTS, **kwargs})
 
     def test_path_is_relative(self):
         p = self._make_photo()
@@ -113,6 +122,23 @@ class TestPhoto:
         p = self._make_photo(timestamp_exif=None, timestamp_file=file_ts)
         assert p.best_timestamp == file_ts
 
+    def test_ts_seconds_of_day(self):
+        exif_ts = datetime(2026, 2, 9, 10, 30, 15, tzinfo=timezone.utc)
+        p = self._make_photo(timestamp_exif=exif_ts)
+        assert p.ts_seconds_of_day == 10 * 3600 + 30 * 60 + 15
+
+    def test_ts_seconds_of_day_uses_own_wall_clock(self):
+        cest = timezone(timedelta(hours=2))
+        p = self._make_photo(timestamp_exif=datetime(2026, 6, 9, 10, 0, tzinfo=cest))
+        assert p.ts_seconds_of_day == 36000
+
+    def test_ts_seconds_of_day_follows_copied_timestamp(self):
+        p = self._make_photo(timestamp_exif=datetime(2026, 2, 9, 10, 0, tzinfo=timezone.utc))
+        assert p.ts_seconds_of_day == 36000
+        q = p.model_copy(update={"timestamp_exif": datetime(2026, 2, 9, 11, 0, tzinfo=timezone.utc)})
+        assert q.ts_seconds_of_day == 39600
+        assert q != p
+
     def test_invalid_width_raises(self):
         with pytest.raises(ValidationError):
             self._make_photo(width=0)
@@ -168,6 +194,12 @@ class TestProjectManifest:
 # PhotoAnalysis — OpenAI strict-mode schema validation
 # ---------------------------------------------------------------------------
 
+# Generated once for the schema-shape assertions below
+_PA_SCHEMA = PhotoAnalysis.model_json_schema()
+_PA_PROPS = frozenset(_PA_SCHEMA["properties"])
+_PA_REQUIRED = frozenset(_PA_SCHEMA["required"])
+
+
 class TestPhotoAnalysis:
     def test_all_scene_types(self):
         for scene in ("flipchart", "group", "activity", "result", "unknown"):
@@ -189,20 +221,15 @@ class TestPhotoAnalysis:
 
     def test_schema_all_properties_in_required(self):
         """OpenAI strict mode requires all properties in required[]."""
-        schema = PhotoAnalysis.model_json_schema()
-        props = set(schema.get("properties", {}).keys())
-        required = set(schema.get("required", []))
-        assert props == required, f"Missing from required: {props - required}"
+        assert _PA_PROPS == _PA_REQUIRED, f"Missing from required: {_PA_PROPS - _PA_REQUIRED}"
 
     def test_schema_additional_properties_false(self):
         """OpenAI strict mode requires additionalProperties: false."""
-        schema = PhotoAnalysis.model_json_schema()
-        assert schema.get("additionalProperties") is False
+        assert _PA_SCHEMA.get("additionalProperties") is False
 
     def test_schema_nullable_field_uses_any_of(self):
         """OpenAI strict mode expects nullable as anyOf: [type, null]."""
-        schema = PhotoAnalysis.model_json_schema()
-        ocr_text_schema = schema["properties"]["ocr_text"]
+        ocr_text_schema = _PA_SCHEMA["properties"]["ocr_text"]
         assert "anyOf" in ocr_text_schema
         types = {item.get("type") for item in ocr_text_schema["anyOf"]}
         assert types == {"string", "null"}
@@ -244,6 +271,36 @@ class TestEnrichedPhotos:
         assert es.by_photo_id("photo_001") is e
         assert es.by_photo_id("missing") is None
 
+    def test_by_photo_id_large_set(self):
+        photos = [
+            EnrichedPhoto(photo_id=f"photo_{i:04d}", scene_type="group",
+                          description="x", analysis_model="gpt-5")
+            for i in range(1000)
+        ]
+        es = EnrichedPhotoSet(enriched_photos=photos)
+        for p in photos:
+            assert es.by_photo_id(p.photo_id) is p
+        assert es.by_photo_id("photo_1000") is None
+
+    def test_by_photo_id_follows_list_changes(self):
+        e1 = EnrichedPhoto(photo_id="p1", scene_type="group", description="x",
+                           analysis_model="gpt-5")
+        e2 = EnrichedPhoto(photo_id="p2", scene_type="group", description="y",
+                           analysis_model="gpt-5")
+        other = EnrichedPhoto(photo_id="p1", scene_type="result", description="z",
+                              analysis_model="gpt-5")
+        es = EnrichedPhotoSet(enriched_photos=[e1])
+        assert es.by_photo_id("p2") is None
+        es.enriched_photos.append(e2)
+        assert es.by_photo_id("p2") is e2
+        es.enriched_photos[0] = other  # replaced in place, same length
+        assert es.by_photo_id("p1") is other
+        es.enriched_photos.sort(key=lambda p: p.photo_id, reverse=True)
+        es.enriched_photos[0] = e1     # p2 slot now holds a p1 photo
+        assert es.by_photo_id("p2") is None
+        replaced = es.model_copy(update={"enriched_photos": [e2]})
+        assert replaced.by_photo_id("p1") is None
+
     def test_enriched_photo_set_round_trip(self):
         es = EnrichedPhotoSet(enriched_photos=[
             EnrichedPhoto(photo_id="p1", scene_type="result",
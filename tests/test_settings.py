@@ -35,11 +35,16 @@ def test_settings_missing_api_key_raises(monkeypatch):
     assert "openai_api_key" in str(exc_info.value)
 
 
-def test_confidence_threshold_must_be_fraction():
+@pytest.mark.parametrize("threshold", [-0.1, 1.5])
+def test_confidence_threshold_must_be_fraction(threshold):
     with pytest.raises(ValidationError):
-        Settings(openai_api_key="sk-test", match_confidence_threshold=1.5)
+        Settings(openai_api_key="sk-test", match_confidence_threshold=threshold)
+
+
+@pytest.mark.parametrize("field", ["vision_concurrency", "vision_batch_threshold"])
+def test_vision_limits_must_be_positive(field):
     with pytest.raises(ValidationError):
-        Settings(openai_api_key="sk-test", match_confidence_threshold=-0.1)
+        Settings(openai_api_key="sk-test", **{field: 0})
 
 
 def test_max_photos_per_page_must_be_positive():
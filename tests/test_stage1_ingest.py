@@ -2,22 +2,32 @@
 
 All OpenAI API calls are mocked — no network access required.
 """
-import json
+import functools
+import os
+from dataclasses import dataclass
 from datetime import date, datetime, time, timezone
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+import orjson
 import pytest
-from PIL import Image
+from openai import APIConnectionError, RateLimitError
 
+from helpers import adapter, jpeg_bytes
 from models.manifest import ProjectManifest
-from pipeline.stage1_ingest import run
-from settings import Settings
+from pipeline.stage1_ingest import _inventory_photos, run
 from utils.agenda_parser import (
+    _MAX_TEXT_CHARS,
     _AgendaSchema,
     _SessionSchema,
     _clean_filename,
+    _extract_via_regex,
     _parse_date_string,
+    _parse_time_string,
+    _read_docx,
+    _read_text,
+    _scan_date_cached,
     _regex_title,
     _regex_date,
     parse_agenda,
@@ -28,28 +38,99 @@ from utils.agenda_parser import (
 # Fixtures
 # ---------------------------------------------------------------------------
 
-def _make_llm_response(schema: _AgendaSchema) -> MagicMock:
-    """Build a mock openai response that returns the given _AgendaSchema."""
-    mock_choice = MagicMock()
-    mock_choice.message.parsed = schema
-    mock_response = MagicMock()
-    mock_response.choices = [mock_choice]
-    return mock_response
+_MANIFEST_ADAPTER = adapter(ProjectManifest)
 
 
-def _mock_llm(schema: _AgendaSchema):
-    """Context manager: patch the OpenAI client to return the given schema."""
-    mock_client = MagicMock()
-    mock_client.beta.chat.completions.parse.return_value = _make_llm_response(schema)
-    return patch("utils.agenda_parser.OpenAI", return_value=mock_client)
+@dataclass
+class _StubResp:
+    choices: list
+
+
+def _make_llm_response(schema: _AgendaSchema) -> _StubResp:
+    """Build a stub openai response that returns the given _AgendaSchema."""
+    return _StubResp(choices=[SimpleNamespace(message=SimpleNamespace(parsed=schema))])
+
+
+class _StubParse:
+    """Stands in for ``client.beta.chat.completions.parse``.
+
+    Each call consumes the next queued outcome: exceptions are raised,
+    anything else is returned.
+    """
+
+    def __init__(self) -> None:
+        self.outcomes: list = []
+        self.call_count = 0
+
+    def queue(self, *outcomes) -> None:
+        self.outcomes = list(outcomes)
+        self.call_count = 0
+
+    def __call__(self, **kwargs):
+        self.call_count += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+class _StubClient:
+    def __init__(self, parse: _StubParse) -> None:
+        self.parse = parse
+        self.beta = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(parse=parse)))
+
+    def factory(self, **kwargs) -> "_StubClient":
+        """Pass as ``_client_factory``; ignores the api_key and returns this client."""
+        return self
+
+
+def _unavailable_client(**kwargs):
+    raise Exception("API down")
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_read(p: str) -> str:
+    """Read a fixture file once; the sample project is never modified."""
+    return Path(p).read_text(encoding="utf-8")
+
+
+_PROJ_DIRS = ("agenda", "fotos", "text", "template")
+
+
+def _scaffold(tmp: Path, dirs: tuple[str, ...] = _PROJ_DIRS) -> None:
+    """Create the project subdirectories ``dirs`` under ``tmp``."""
+    base = os.fspath(tmp)
+    for d in dirs:
+        os.mkdir(os.path.join(base, d))
+
+
+@pytest.fixture(scope="session")
+def empty_project(tmp_path_factory) -> Path:
+    """A fully scaffolded project with no inputs, shared by the tests that only
+    check the returned manifest. Tests asserting on files run() writes use a
+    fresh tmp_path instead, since earlier runs leave .cache/ populated."""
+    base = tmp_path_factory.mktemp("empty_proj")
+    _scaffold(base)
+    return base
 
 
 # ---------------------------------------------------------------------------
 # agenda_parser — LLM path
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="class")
+def _shared_llm_client():
+    return _StubClient(_StubParse())
+
+
 class TestAgendaParserLLM:
-    def test_extracts_full_metadata(self, sample_project_dir, settings):
+    @pytest.fixture
+    def llm_client(self, _shared_llm_client):
+        """The class-wide stub client with an empty outcome queue."""
+        _shared_llm_client.parse.queue()
+        return _shared_llm_client
+
+    def test_extracts_full_metadata(self, sample_project_dir, settings, llm_client):
         agenda_path = sample_project_dir / "agenda" / "agenda.txt"
         expected = _AgendaSchema(
             title="Test-Workshop Gelingensfaktoren",
@@ -63,8 +144,8 @@ class TestAgendaParserLLM:
                 _SessionSchema(name="Abschluss", start_time="12:00", end_time=None),
             ],
         )
-        with _mock_llm(expected):
-            meta, sessions = parse_agenda(agenda_path, settings)
+        llm_client.parse.queue(_make_llm_response(expected))
+        meta, sessions = parse_agenda(agenda_path, settings, _client_factory=llm_client.factory)
 
         assert meta.title == "Test-Workshop Gelingensfaktoren"
         assert meta.workshop_date == date(2026, 2, 9)
@@ -75,7 +156,7 @@ class TestAgendaParserLLM:
         assert sessions[0].end_time == time(10, 0)
         assert sessions[-1].end_time is None
 
-    def test_session_ids_and_order(self, sample_project_dir, settings):
+    def test_session_ids_and_order(self, sample_project_dir, settings, llm_client):
         agenda_path = sample_project_dir / "agenda" / "agenda.txt"
         schema = _AgendaSchema(
             title="Workshop",
@@ -87,55 +168,72 @@ class TestAgendaParserLLM:
                 _SessionSchema(name="Block B", start_time="10:30"),
             ],
         )
-        with _mock_llm(schema):
-            _, sessions = parse_agenda(agenda_path, settings)
+        llm_client.parse.queue(_make_llm_response(schema))
+        _, sessions = parse_agenda(agenda_path, settings, _client_factory=llm_client.factory)
 
         assert sessions[0].id == "session_001"
         assert sessions[1].id == "session_002"
         assert sessions[0].order == 1
         assert sessions[1].order == 2
 
-    def test_null_date_returns_none(self, sample_project_dir, settings):
+    def test_null_date_returns_none(self, sample_project_dir, settings, llm_client):
         agenda_path = sample_project_dir / "agenda" / "agenda.txt"
         schema = _AgendaSchema(
             title="Workshop", workshop_date=None,
             location=None, participants=None,
             sessions=[_SessionSchema(name="Session")],
         )
-        with _mock_llm(schema):
-            meta, _ = parse_agenda(agenda_path, settings)
+        llm_client.parse.queue(_make_llm_response(schema))
+        meta, _ = parse_agenda(agenda_path, settings, _client_factory=llm_client.factory)
         assert meta.workshop_date is None
 
     def test_falls_back_to_regex_on_llm_failure(self, sample_project_dir, settings):
         agenda_path = sample_project_dir / "agenda" / "agenda.txt"
-        with patch("utils.agenda_parser.OpenAI", side_effect=Exception("API down")):
-            meta, sessions = parse_agenda(agenda_path, settings)
+        meta, sessions = parse_agenda(agenda_path, settings, _client_factory=_unavailable_client)
 
         # Regex fallback should extract something sensible from the fixture txt
         assert meta.title  # not empty
         assert len(sessions) >= 1
 
-    def test_rate_limit_retries(self, sample_project_dir, settings):
-        from openai import RateLimitError as _RateLimitError
-
+    def test_rate_limit_retries(self, sample_project_dir, settings, llm_client):
         agenda_path = sample_project_dir / "agenda" / "agenda.txt"
         expected = _AgendaSchema(
             title="Workshop", workshop_date=None, location=None,
             participants=None, sessions=[_SessionSchema(name="Session")],
         )
-        mock_client = MagicMock()
         # Fail twice, succeed on third attempt
-        mock_client.beta.chat.completions.parse.side_effect = [
-            _RateLimitError("rate limit", response=MagicMock(status_code=429), body={}),
-            _RateLimitError("rate limit", response=MagicMock(status_code=429), body={}),
-            _make_llm_response(expected),
-        ]
-        with patch("utils.agenda_parser.OpenAI", return_value=mock_client), \
-             patch("utils.agenda_parser.time_module.sleep"):  # don't actually sleep
-            meta, _ = parse_agenda(agenda_path, settings)
+        err = RateLimitError("rate limit", response=MagicMock(status_code=429), body={})
+        llm_client.parse.queue(err, err, _make_llm_response(expected))
+        meta, _ = parse_agenda(
+            agenda_path, settings, _client_factory=llm_client.factory, _sleep=lambda _: None,
+        )
 
         assert meta.title == "Workshop"
-        assert mock_client.beta.chat.completions.parse.call_count == 3
+        assert llm_client.parse.call_count == 3
+
+    def test_rate_limit_honours_retry_after(self, sample_project_dir, settings, llm_client):
+        response = MagicMock(status_code=429, headers={"retry-after": "0.25"})
+        err = RateLimitError("rate limit", response=response, body={})
+        schema = _AgendaSchema(title="Workshop", sessions=[_SessionSchema(name="Session")])
+        llm_client.parse.queue(err, _make_llm_response(schema))
+        delays: list[float] = []
+        parse_agenda(
+            sample_project_dir / "agenda" / "agenda.txt", settings,
+            _client_factory=llm_client.factory, _sleep=delays.append,
+        )
+        assert delays == [0.25]
+
+    def test_connection_error_retried_once_then_falls_back(self, sample_project_dir, settings, llm_client):
+        err = APIConnectionError(request=MagicMock())
+        llm_client.parse.queue(err, err)
+        delays: list[float] = []
+        meta, _ = parse_agenda(
+            sample_project_dir / "agenda" / "agenda.txt", settings,
+            _client_factory=llm_client.factory, _sleep=delays.append,
+        )
+        assert llm_client.parse.call_count == 2
+        assert len(delays) == 1
+        assert meta.title  # regex fallback
 
 
 # ---------------------------------------------------------------------------
@@ -143,17 +241,51 @@ class TestAgendaParserLLM:
 # ---------------------------------------------------------------------------
 
 class TestAgendaParserRegex:
-    def test_parse_date_ddmmyyyy(self):
-        assert _parse_date_string("Datum: 09.02.2026") == date(2026, 2, 9)
-
-    def test_parse_date_ddmmyy(self):
-        assert _parse_date_string("09.02.26") == date(2026, 2, 9)
+    @pytest.mark.parametrize("text,expected", [
+        ("Datum: 09.02.2026", date(2026, 2, 9)),
+        ("09.02.26", date(2026, 2, 9)),
+        ("2026-02-09", date(2026, 2, 9)),
+        ("no date here", None),
+        ("2026-02-09, verschoben auf 01.03.2026", date(2026, 3, 1)),  # format order, not position
+        ("31.02.2026 bzw. 09.02.26", date(2026, 2, 9)),  # invalid date falls through
+    ])
+    def test_parse_date(self, text, expected):
+        assert _parse_date_string(text) == expected
+
+    def test_regex_sessions_end_at_next_start(self):
+        text = "09:00 Begrüßung\n9.45 Gruppenarbeit\n11:00 Abschluss\n"
+        sessions = _extract_via_regex(text, Path("agenda.txt")).sessions
+        assert [(x.start_time, x.end_time) for x in sessions] == [
+            ("09:00", "09:45"), ("09:45", "11:00"), ("11:00", None),
+        ]
 
-    def test_parse_date_iso(self):
-        assert _parse_date_string("2026-02-09") == date(2026, 2, 9)
+    def test_label_fields_first_value_each(self):
+        text = "Titel: Klausur\nOrt: Berlin\nTN: 12\nOrt: Hamburg\nDatum: 09.02.2026\n"
+        result = _extract_via_regex(text, Path("agenda.txt"))
+        assert (result.title, result.location, result.participants, result.workshop_date) == (
+            "Klausur", "Berlin", 12, "2026-02-09",
+        )
 
-    def test_parse_date_invalid_returns_none(self):
-        assert _parse_date_string("no date here") is None
+    def test_parse_date_caches_short_strings_only(self):
+        _scan_date_cached.cache_clear()
+        assert _parse_date_string("Stand 09.02.2026") == date(2026, 2, 9)
+        assert _parse_date_string("Stand 09.02.2026") == date(2026, 2, 9)
+        long_text = "x" * 5000 + " 09.02.2026"
+        assert _parse_date_string(long_text) == date(2026, 2, 9)
+        info = _scan_date_cached.cache_info()
+        assert (info.hits, info.currsize) == (1, 1)
+
+    @pytest.mark.parametrize("value,expected", [
+        ("09:30", time(9, 30)),
+        (" 9:05 ", time(9, 5)),
+        ("24:00", None),
+        ("9:5", None),
+        ("9.30", None),
+        ("", None),
+        (None, None),
+    ])
+    def test_parse_time(self, value, expected):
+        assert _parse_time_string(value) == expected
 
     def test_clean_filename_removes_date_and_suffixes(self):
         assert _clean_filename("Ablaufidee Workshop 09.02.26_final") == "Ablaufidee Workshop"
@@ -163,53 +295,77 @@ class TestAgendaParserRegex:
 
     def test_regex_title_uses_label(self, sample_project_dir):
         path = sample_project_dir / "agenda" / "agenda.txt"
-        text = path.read_text()
+        text = _cached_read(str(path))
         assert "Gelingensfaktoren" in _regex_title(text, path)
 
+    def test_regex_title_skips_time_and_short_lines(self):
+        text = "\n  \r\n09:00 Start\nAB\n  Strategieklausur 2026  \nWeitere Zeile"
+        assert _regex_title(text, Path("agenda.txt")) == "Strategieklausur 2026"
+
     def test_regex_date_finds_labelled_date(self, sample_project_dir):
         path = sample_project_dir / "agenda" / "agenda.txt"
-        text = path.read_text()
+        text = _cached_read(str(path))
         assert _regex_date(text, path) == date(2026, 2, 9)
 
 
+class TestReadText:
+    def test_plain_text_read_up_to_budget(self, tmp_path):
+        path = tmp_path / "agenda.txt"
+        path.write_text("ä" * (_MAX_TEXT_CHARS + 100), encoding="utf-8")
+        assert _read_text(path) == "ä" * _MAX_TEXT_CHARS
+
+    def test_docx_stops_at_budget(self, tmp_path):
+        from docx import Document
+        doc = Document()
+        line = "x" * 999
+        for _ in range(_MAX_TEXT_CHARS // 1000 + 10):
+            doc.add_paragraph(line)
+        table = doc.add_table(rows=1, cols=2)
+        table.rows[0].cells[0].text = "09:00"
+        table.rows[0].cells[1].text = "Nach dem Limit"
+        path = tmp_path / "agenda.docx"
+        doc.save(path)
+        text = _read_docx(path)
+        assert _MAX_TEXT_CHARS <= len(text) + 1 < _MAX_TEXT_CHARS + 1000
+        assert "Nach dem Limit" not in text
+
+
 # ---------------------------------------------------------------------------
 # Stage 1 run() — photo inventory
 # ---------------------------------------------------------------------------
 
 class TestStage1Photos:
-    def _make_project(self, tmp_path, photos: list[tuple[str, tuple[int, int]]] = None):
+    def _make_project(self, base_settings, tmp_path, photos: list[tuple[str, tuple[int, int]]] = None):
         """Helper: create a minimal project directory structure."""
+        _scaffold(tmp_path)
         fotos = tmp_path / "fotos"
-        fotos.mkdir()
         for name, size in (photos or []):
-            Image.new("RGB", size).save(fotos / name)
-        for d in ("agenda", "text", "template"):
-            (tmp_path / d).mkdir()
-        return Settings(openai_api_key="test", project_dir=tmp_path)
+            (fotos / name).write_bytes(jpeg_bytes(*size))
+        return base_settings.model_copy(update={"project_dir": tmp_path})
 
-    def test_inventories_all_photos(self, tmp_path):
-        s = self._make_project(tmp_path, [("a.jpg", (800, 600)), ("b.jpg", (800, 600))])
+    def test_inventories_all_photos(self, base_settings, tmp_path):
+        s = self._make_project(base_settings, tmp_path, [("a.jpg", (800, 600)), ("b.jpg", (800, 600))])
         manifest = run(s)
         assert len(manifest.photos) == 2
 
-    def test_photos_have_relative_paths(self, tmp_path):
-        s = self._make_project(tmp_path, [("img.jpg", (800, 600))])
+    def test_photos_have_relative_paths(self, base_settings, tmp_path):
+        s = self._make_project(base_settings, tmp_path, [("img.jpg", (800, 600))])
         manifest = run(s)
         assert not manifest.photos[0].path.is_absolute()
         assert manifest.photos[0].path == Path("fotos/img.jpg")
 
-    def test_landscape_orientation(self, tmp_path):
-        s = self._make_project(tmp_path, [("img.jpg", (800, 600))])
+    def test_landscape_orientation(self, base_settings, tmp_path):
+        s = self._make_project(base_settings, tmp_path, [("img.jpg", (800, 600))])
         manifest = run(s)
         assert manifest.photos[0].orientation == "landscape"
 
-    def test_portrait_orientation(self, tmp_path):
-        s = self._make_project(tmp_path, [("img.jpg", (600, 800))])
+    def test_portrait_orientation(self, base_settings, tmp_path):
+        s = self._make_project(base_settings, tmp_path, [("img.jpg", (600, 800))])
         manifest = run(s)
         assert manifest.photos[0].orientation == "portrait"
 
-    def test_file_mtime_used_as_timestamp_fallback(self, tmp_path):
-        s = self._make_project(tmp_path, [("img.jpg", (800, 600))])
+    def test_file_mtime_used_as_timestamp_fallback(self, base_settings, tmp_path):
+        s = self._make_project(base_settings, tmp_path, [("img.jpg", (800, 600))])
         manifest = run(s)
         photo = manifest.photos[0]
         assert photo.timestamp_exif is None
@@ -217,15 +373,23 @@ class TestStage1Photos:
         assert photo.timestamp_file.tzinfo == timezone.utc
         assert photo.best_timestamp == photo.timestamp_file
 
-    def test_photos_sorted_by_filename(self, tmp_path):
-        s = self._make_project(tmp_path, [("c.jpg", (800, 600)), ("a.jpg", (800, 600)), ("b.jpg", (800, 600))])
+    def test_photos_sorted_by_filename(self, base_settings, tmp_path):
+        s = self._make_project(base_settings, tmp_path, [("c.jpg", (800, 600)), ("a.jpg", (800, 600)), ("b.jpg", (800, 600))])
         manifest = run(s)
         assert [p.filename for p in manifest.photos] == ["a.jpg", "b.jpg", "c.jpg"]
 
-    def test_missing_photos_dir_returns_empty(self, tmp_path):
-        for d in ("agenda", "text", "template"):
-            (tmp_path / d).mkdir()
-        s = Settings(openai_api_key="test", project_dir=tmp_path)
+    def test_inventory_assigns_ids_in_filename_order(self, base_settings, tmp_path):
+        _scaffold(tmp_path, ("fotos",))
+        for name in ("c.jpg", "a.jpg", "b.jpg"):
+            (tmp_path / "fotos" / name).write_bytes(jpeg_bytes(800, 600))
+        s = base_settings.model_copy(update={"project_dir": tmp_path})
+        photos = _inventory_photos(s)
+        assert [(p.id, p.filename) for p in photos] == [
+            ("photo_001", "a.jpg"), ("photo_002", "b.jpg"), ("photo_003", "c.jpg"),
+        ]
+
+    def test_missing_photos_dir_returns_empty(self, base_settings, tmp_path):
+        s = base_settings.model_copy(update={"project_dir": tmp_path})
         manifest = run(s)
         assert manifest.photos == []
 
@@ -235,28 +399,20 @@ class TestStage1Photos:
 # ---------------------------------------------------------------------------
 
 class TestStage1TextSnippets:
-    def test_reads_text_snippets(self, settings, tmp_path):
-        text_dir = tmp_path / "text"
-        text_dir.mkdir()
-        (text_dir / "notes.md").write_text("Ergebnis Eins Zwei Drei", encoding="utf-8")
-        for d in ("agenda", "fotos", "template"):
-            (tmp_path / d).mkdir()
+    def test_reads_text_snippets(self, base_settings, tmp_path):
+        _scaffold(tmp_path, ("text",))
+        (tmp_path / "text" / "notes.md").write_text("Ergebnis Eins Zwei Drei", encoding="utf-8")
 
-        s = Settings(openai_api_key="test", project_dir=tmp_path)
-        with patch("utils.agenda_parser.OpenAI", side_effect=Exception("no api")):
-            manifest = run(s)
+        s = base_settings.model_copy(update={"project_dir": tmp_path})
+        manifest = run(s)
 
         assert len(manifest.text_snippets) == 1
         assert manifest.text_snippets[0].word_count == 4
         assert manifest.text_snippets[0].filename == "notes.md"
 
-    def test_missing_text_dir_returns_empty(self, tmp_path):
-        for d in ("agenda", "fotos", "template"):
-            (tmp_path / d).mkdir()
-
-        s = Settings(openai_api_key="test", project_dir=tmp_path)
-        with patch("utils.agenda_parser.OpenAI", side_effect=Exception("no api")):
-            manifest = run(s)
+    def test_missing_text_dir_returns_empty(self, base_settings, tmp_path):
+        s = base_settings.model_copy(update={"project_dir": tmp_path})
+        manifest = run(s)
 
         assert manifest.text_snippets == []
 
@@ -266,23 +422,18 @@ class TestStage1TextSnippets:
 # ---------------------------------------------------------------------------
 
 class TestStage1AgendaFallback:
-    def test_missing_agenda_produces_default_session(self, tmp_path):
-        for d in ("fotos", "text", "template"):
-            (tmp_path / d).mkdir()
+    def test_missing_agenda_produces_default_session(self, base_settings, tmp_path):
         # no agenda/ dir
 
-        s = Settings(openai_api_key="test", project_dir=tmp_path)
+        s = base_settings.model_copy(update={"project_dir": tmp_path})
         manifest = run(s)
 
         assert len(manifest.sessions) == 1
         assert manifest.sessions[0].name == "Workshop"
         assert manifest.meta.title == "Workshop"
 
-    def test_empty_agenda_dir_produces_default_session(self, tmp_path):
-        for d in ("agenda", "fotos", "text", "template"):
-            (tmp_path / d).mkdir()
-
-        s = Settings(openai_api_key="test", project_dir=tmp_path)
+    def test_empty_agenda_dir_produces_default_session(self, base_settings, empty_project):
+        s = base_settings.model_copy(update={"project_dir": empty_project})
         manifest = run(s)
 
         assert manifest.sessions[0].name == "Workshop"
@@ -293,26 +444,22 @@ class TestStage1AgendaFallback:
 # ---------------------------------------------------------------------------
 
 class TestStage1Artifact:
-    def test_manifest_written_to_cache(self, tmp_path):
-        for d in ("agenda", "fotos", "text", "template"):
-            (tmp_path / d).mkdir()
-
-        s = Settings(openai_api_key="test", project_dir=tmp_path)
+    def test_manifest_written_to_cache(self, base_settings, tmp_path):
+        _scaffold(tmp_path)
+        s = base_settings.model_copy(update={"project_dir": tmp_path})
         run(s)
 
         artifact = tmp_path / ".cache" / "manifest.json"
         assert artifact.exists()
-        data = json.loads(artifact.read_text())
+        data = orjson.loads(artifact.read_bytes())
         assert "meta" in data
         assert "photos" in data
 
-    def test_manifest_roundtrips_from_json(self, tmp_path):
-        for d in ("agenda", "fotos", "text", "template"):
-            (tmp_path / d).mkdir()
-
-        s = Settings(openai_api_key="test", project_dir=tmp_path)
+    def test_manifest_roundtrips_from_json(self, base_settings, tmp_path):
+        _scaffold(tmp_path)
+        s = base_settings.model_copy(update={"project_dir": tmp_path})
         manifest = run(s)
 
         artifact = tmp_path / ".cache" / "manifest.json"
-        loaded = ProjectManifest.model_validate_json(artifact.read_text())
+        loaded = _MANIFEST_ADAPTER.validate_json(artifact.read_bytes())
         assert loaded == manifest
@@ -2,14 +2,19 @@
 
 All OpenAI Vision API calls are mocked — no network access required.
 """
+import asyncio
+import io
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from PIL import Image
+from PIL import Image, ImageOps
 
+from helpers import fast_settings, jpeg_bytes
 from models.enriched_photos import (
     CropBox,
     EnrichedPhoto,
@@ -17,7 +22,15 @@ from models.enriched_photos import (
     PhotoAnalysis,
 )
 from models.manifest import Photo, ProjectManifest, WorkshopMeta
-from pipeline.stage3a_enrich import _crop_with_margin, _detect_mime, run
+from pipeline.stage3a_enrich import (
+    _cache_key,
+    _crop_with_margin,
+    _detect_mime,
+    _file_cache_key,
+    _load_api_bytes,
+    _load_for_processing,
+    run,
+)
 from settings import Settings
 
 _NOW = datetime(2026, 2, 9, 12, 0, 0, tzinfo=timezone.utc)
@@ -52,22 +65,29 @@ def _make_flipchart_analysis() -> PhotoAnalysis:
     )
 
 
-def _make_llm_response(analysis: PhotoAnalysis) -> MagicMock:
-    mock_choice = MagicMock()
-    mock_choice.message.parsed = analysis
-    mock_response = MagicMock()
-    mock_response.choices = [mock_choice]
-    return mock_response
+def _make_llm_response(analysis: PhotoAnalysis) -> SimpleNamespace:
+    """Plain-attribute stand-in for a parsed chat completion."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(parsed=analysis))])
+
+
+def _make_client(analysis: PhotoAnalysis | None = None) -> MagicMock:
+    """Mock AsyncOpenAI client whose awaitable parse() returns ``analysis``."""
+    mock_client = MagicMock()
+    mock_client.beta.chat.completions.parse = AsyncMock(
+        return_value=_make_llm_response(analysis) if analysis is not None else None
+    )
+    mock_client.close = AsyncMock()
+    return mock_client
 
 
 def _make_project(tmp_path, photos: list[tuple[str, tuple[int, int]]] = None) -> Settings:
     fotos = tmp_path / "fotos"
     fotos.mkdir()
     for name, size in (photos or []):
-        Image.new("RGB", size).save(fotos / name)
+        (fotos / name).write_bytes(jpeg_bytes(*size))
     for d in ("agenda", "text", "template"):
         (tmp_path / d).mkdir()
-    return Settings(openai_api_key="test", project_dir=tmp_path)
+    return fast_settings(project_dir=tmp_path)
 
 
 def _make_manifest(settings: Settings, photo_names: list[str] = None) -> ProjectManifest:
@@ -128,6 +148,54 @@ class TestCropWithMargin:
         assert result.size == (1000, 500)  # clamped — same as original
 
 
+class TestApiBytes:
+    def test_small_photo_keeps_size(self, tmp_path):
+        path = tmp_path / "img.jpg"
+        path.write_bytes(jpeg_bytes(800, 600))
+        assert Image.open(io.BytesIO(_load_api_bytes(path))).size == (800, 600)
+
+    def test_bytes_only_path_downscales_too(self, tmp_path):
+        path = tmp_path / "big.jpg"
+        path.write_bytes(jpeg_bytes(3000, 1500))
+        assert Image.open(io.BytesIO(_load_api_bytes(path))).size == (2048, 1024)
+
+
+class TestLoadForProcessing:
+    def test_large_jpeg_decoded_at_reduced_scale(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("pipeline.stage3a_enrich._PROCESSED_MIN_EDGE", 100)
+        path = tmp_path / "big.jpg"
+        path.write_bytes(jpeg_bytes(800, 600))
+        assert _load_for_processing(path).size == (200, 150)
+
+    def test_never_scales_below_min_edge(self, tmp_path):
+        path = tmp_path / "img.jpg"
+        path.write_bytes(jpeg_bytes(800, 600))
+        assert _load_for_processing(path).size == (800, 600)
+
+    def test_applies_exif_orientation(self, tmp_path):
+        img = Image.new("RGB", (800, 600))
+        exif = img.getexif()
+        exif[274] = 6  # rotate 90° CW for display
+        path = tmp_path / "rot.jpg"
+        img.save(path, format="JPEG", exif=exif)
+        assert _load_for_processing(path).size == (600, 800)
+
+    @pytest.mark.parametrize("orientation", range(1, 9))
+    def test_crop_matches_crop_after_transpose(self, tmp_path, orientation):
+        img = Image.effect_mandelbrot((160, 120), (-2.0, -1.2, 1.0, 1.2), 64).convert("RGB")
+        exif = img.getexif()
+        exif[274] = orientation
+        path = tmp_path / "img.jpg"
+        img.save(path, format="JPEG", exif=exif)
+        box = CropBox(x_min=0.1, y_min=0.2, x_max=0.6, y_max=0.9)
+
+        expected = _crop_with_margin(ImageOps.exif_transpose(Image.open(path)), box)
+        result = _load_for_processing(path, box)
+
+        assert result.size == expected.size
+        assert result.tobytes() == expected.tobytes()
+
+
 # ---------------------------------------------------------------------------
 # Cache behaviour
 # ---------------------------------------------------------------------------
@@ -136,10 +204,9 @@ class TestCacheBehaviour:
     def test_cache_miss_calls_api(self, tmp_path):
         s = _make_project(tmp_path, [("img.jpg", (800, 600))])
         manifest = _make_manifest(s, ["img.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             run(s, manifest)
 
         assert mock_client.beta.chat.completions.parse.call_count == 1
@@ -147,10 +214,9 @@ class TestCacheBehaviour:
     def test_cache_hit_skips_api(self, tmp_path):
         s = _make_project(tmp_path, [("img.jpg", (800, 600))])
         manifest = _make_manifest(s, ["img.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             run(s, manifest)
             run(s, manifest)
 
@@ -159,22 +225,67 @@ class TestCacheBehaviour:
     def test_cache_file_written_per_photo(self, tmp_path):
         s = _make_project(tmp_path, [("a.jpg", (800, 600)), ("b.jpg", (801, 600))])
         manifest = _make_manifest(s, ["a.jpg", "b.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             run(s, manifest)
 
         assert len(list(s.analyses_dir.glob("*.json"))) == 2
 
+    def test_renamed_duplicate_photo_hits_cache(self, tmp_path):
+        s = _make_project(tmp_path, [("img.jpg", (800, 600))])
+        (s.fotos_dir / "copy.jpg").write_bytes((s.fotos_dir / "img.jpg").read_bytes())
+        mock_client = _make_client(_make_analysis())
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            run(s, _make_manifest(s, ["img.jpg"]))
+            result = run(s, _make_manifest(s, ["copy.jpg"]))
+
+        assert mock_client.beta.chat.completions.parse.call_count == 1
+        assert len(result.enriched_photos) == 1
+
+    def test_model_change_invalidates_cache(self, tmp_path):
+        s = _make_project(tmp_path, [("img.jpg", (800, 600))])
+        manifest = _make_manifest(s, ["img.jpg"])
+        mock_client = _make_client(_make_analysis())
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            run(s, manifest)
+            run(s.model_copy(update={"vision_model": "other-model"}), manifest)
+
+        assert mock_client.beta.chat.completions.parse.call_count == 2
+
+    def test_cache_key_covers_prompt_and_schema_versions(self):
+        base = _cache_key(b"img", "gpt-5", "1", "1")
+        assert base != _cache_key(b"img", "gpt-5", "2", "1")
+        assert base != _cache_key(b"img", "gpt-5", "1", "2")
+        assert base != _cache_key(b"other", "gpt-5", "1", "1")
+
+    def test_file_key_matches_bytes_key(self, tmp_path):
+        path = tmp_path / "img.jpg"
+        path.write_bytes(jpeg_bytes(800, 600))
+        assert _file_cache_key(path, "gpt-5") == _cache_key(path.read_bytes(), "gpt-5")
+
+    def test_file_key_handles_empty_file(self, tmp_path):
+        path = tmp_path / "empty.jpg"
+        path.write_bytes(b"")
+        assert _file_cache_key(path, "gpt-5") == _cache_key(b"", "gpt-5")
+
+    def test_no_temp_files_left_behind(self, tmp_path):
+        s = _make_project(tmp_path, [("img.jpg", (800, 600))])
+        manifest = _make_manifest(s, ["img.jpg"])
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=_make_client(_make_analysis())):
+            run(s, manifest)
+
+        assert [p.suffix for p in s.analyses_dir.iterdir()] == [".json"]
+
     def test_cached_result_roundtrips(self, tmp_path):
         s = _make_project(tmp_path, [("img.jpg", (800, 600))])
         manifest = _make_manifest(s, ["img.jpg"])
         analysis = _make_analysis(ocr_text="Ergebnis A", topic_keywords=["vernetzung"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(analysis)
+        mock_client = _make_client(analysis)
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             first = run(s, manifest)
         second = run(s, manifest)  # no mock — must read from cache
 
@@ -190,12 +301,9 @@ class TestCropping:
     def test_flipchart_with_crop_box_saves_processed_file(self, tmp_path):
         s = _make_project(tmp_path, [("flip.jpg", (1000, 800))])
         manifest = _make_manifest(s, ["flip.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(
-            _make_flipchart_analysis()
-        )
+        mock_client = _make_client(_make_flipchart_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         enriched = result.enriched_photos[0]
@@ -206,12 +314,9 @@ class TestCropping:
     def test_flipchart_processed_image_is_smaller_than_original(self, tmp_path):
         s = _make_project(tmp_path, [("flip.jpg", (1000, 800))])
         manifest = _make_manifest(s, ["flip.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(
-            _make_flipchart_analysis()
-        )
+        mock_client = _make_client(_make_flipchart_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         processed_path = s.project_dir / result.enriched_photos[0].processed_path
@@ -219,15 +324,27 @@ class TestCropping:
             w, h = img.size
         assert w < 1000 and h < 800  # crop_box=0.1–0.9 with 3% margin → ~84% of original
 
+    def test_rebuilt_processed_image_matches_original(self, tmp_path):
+        s = _make_project(tmp_path, [("flip.jpg", (1000, 800))])
+        manifest = _make_manifest(s, ["flip.jpg"])
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=_make_client(_make_flipchart_analysis())):
+            first = run(s, manifest)
+        processed_path = s.project_dir / first.enriched_photos[0].processed_path
+        original = processed_path.read_bytes()
+        processed_path.unlink()
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI") as mock_cls:
+            run(s, manifest)
+
+        mock_cls.assert_not_called()
+        assert processed_path.read_bytes() == original
+
     def test_non_document_photo_saved_to_processed(self, tmp_path):
         s = _make_project(tmp_path, [("group.jpg", (800, 600))])
         manifest = _make_manifest(s, ["group.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(
-            _make_analysis(scene_type="group")
-        )
+        mock_client = _make_client(_make_analysis(scene_type="group"))
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         enriched = result.enriched_photos[0]
@@ -241,12 +358,9 @@ class TestCropping:
     def test_crop_box_stored_in_enriched_photo(self, tmp_path):
         s = _make_project(tmp_path, [("flip.jpg", (1000, 800))])
         manifest = _make_manifest(s, ["flip.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(
-            _make_flipchart_analysis()
-        )
+        mock_client = _make_client(_make_flipchart_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         cb = result.enriched_photos[0].crop_box
@@ -263,10 +377,9 @@ class TestEnrichedPhotoSet:
     def test_photo_count_matches_manifest(self, tmp_path):
         s = _make_project(tmp_path, [("a.jpg", (800, 600)), ("b.jpg", (801, 600)), ("c.jpg", (802, 600))])
         manifest = _make_manifest(s, ["a.jpg", "b.jpg", "c.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         assert len(result.enriched_photos) == 3
@@ -274,10 +387,9 @@ class TestEnrichedPhotoSet:
     def test_photo_ids_match_manifest(self, tmp_path):
         s = _make_project(tmp_path, [("a.jpg", (800, 600)), ("b.jpg", (801, 600))])
         manifest = _make_manifest(s, ["a.jpg", "b.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         assert [e.photo_id for e in result.enriched_photos] == ["photo_001", "photo_002"]
@@ -285,10 +397,9 @@ class TestEnrichedPhotoSet:
     def test_analysis_model_recorded(self, tmp_path):
         s = _make_project(tmp_path, [("img.jpg", (800, 600))])
         manifest = _make_manifest(s, ["img.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         assert result.enriched_photos[0].analysis_model == s.vision_model
@@ -297,7 +408,7 @@ class TestEnrichedPhotoSet:
         s = _make_project(tmp_path)
         manifest = _make_manifest(s, [])
 
-        with patch("pipeline.stage3a_enrich.OpenAI"):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI"):
             result = run(s, manifest)
 
         assert result.enriched_photos == []
@@ -305,23 +416,35 @@ class TestEnrichedPhotoSet:
     def test_artifact_written_to_cache(self, tmp_path):
         s = _make_project(tmp_path, [("img.jpg", (800, 600))])
         manifest = _make_manifest(s, ["img.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             run(s, manifest)
 
         artifact = s.cache_dir / "enriched_photos.json"
         assert artifact.exists()
         assert "enriched_photos" in json.loads(artifact.read_text())
 
+    def test_unchanged_artifact_not_rewritten(self, tmp_path):
+        s = _make_project(tmp_path, [("img.jpg", (800, 600))])
+        manifest = _make_manifest(s, ["img.jpg"])
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=_make_client(_make_analysis())):
+            run(s, manifest)
+        artifact = s.cache_dir / "enriched_photos.json"
+        os.utime(artifact, ns=(0, 0))
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI") as mock_cls:
+            run(s, manifest)  # served from cache, identical output
+
+        mock_cls.assert_not_called()
+        assert artifact.stat().st_mtime_ns == 0
+
     def test_artifact_roundtrips_from_json(self, tmp_path):
         s = _make_project(tmp_path, [("img.jpg", (800, 600))])
         manifest = _make_manifest(s, ["img.jpg"])
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         loaded = EnrichedPhotoSet.model_validate_json(
@@ -351,10 +474,9 @@ class TestErrorHandling:
         )
         manifest = manifest.model_copy(update={"photos": [phantom, manifest.photos[0]]})
 
-        mock_client = MagicMock()
-        mock_client.beta.chat.completions.parse.return_value = _make_llm_response(_make_analysis())
+        mock_client = _make_client(_make_analysis())
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client):
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
             result = run(s, manifest)
 
         # Only the valid photo is in the result; missing one is skipped
@@ -362,6 +484,158 @@ class TestErrorHandling:
         assert result.enriched_photos[0].photo_id == "photo_001"
 
 
+# ---------------------------------------------------------------------------
+# Concurrent API calls
+# ---------------------------------------------------------------------------
+
+class TestConcurrency:
+    def test_in_flight_requests_bounded_by_setting(self, tmp_path):
+        names = [f"img{i}.jpg" for i in range(5)]
+        s = _make_project(tmp_path, [(n, (800 + i, 600)) for i, n in enumerate(names)])
+        s = s.model_copy(update={"vision_concurrency": 2})
+        manifest = _make_manifest(s, names)
+        in_flight = peak = 0
+
+        async def parse(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _make_llm_response(_make_analysis())
+
+        mock_client = _make_client()
+        mock_client.beta.chat.completions.parse.side_effect = parse
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            result = run(s, manifest)
+
+        assert peak == 2
+        assert [e.photo_id for e in result.enriched_photos] == [
+            f"photo_{i:03d}" for i in range(1, 6)
+        ]
+
+    def test_failed_call_skips_only_that_photo(self, tmp_path):
+        s = _make_project(tmp_path, [("a.jpg", (800, 600)), ("b.jpg", (801, 600))])
+        manifest = _make_manifest(s, ["a.jpg", "b.jpg"])
+        mock_client = _make_client()
+        mock_client.beta.chat.completions.parse.side_effect = [
+            RuntimeError("boom"),
+            _make_llm_response(_make_analysis()),
+        ]
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            result = run(s, manifest)
+
+        assert len(result.enriched_photos) == 1
+        assert len(list(s.analyses_dir.glob("*.json"))) == 1
+
+    def test_all_cached_does_not_create_client(self, tmp_path):
+        s = _make_project(tmp_path, [("img.jpg", (800, 600))])
+        manifest = _make_manifest(s, ["img.jpg"])
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=_make_client(_make_analysis())):
+            run(s, manifest)
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI") as client_cls:
+            run(s, manifest)
+
+        client_cls.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Batch API path
+# ---------------------------------------------------------------------------
+
+def _batch_output_line(custom_id: str, analysis: PhotoAnalysis) -> str:
+    return json.dumps({
+        "custom_id": custom_id,
+        "response": {
+            "status_code": 200,
+            "body": {"choices": [{"message": {"content": analysis.model_dump_json()}}]},
+        },
+        "error": None,
+    })
+
+
+def _make_batch_client(output_text: str, final_status: str = "completed") -> MagicMock:
+    mock_client = _make_client(_make_analysis())
+    mock_client.files.create = AsyncMock(return_value=SimpleNamespace(id="file-in"))
+    mock_client.batches.create = AsyncMock(
+        return_value=SimpleNamespace(id="batch_1", status="validating", output_file_id=None)
+    )
+    mock_client.batches.retrieve = AsyncMock(side_effect=[
+        SimpleNamespace(id="batch_1", status="in_progress", output_file_id=None),
+        SimpleNamespace(id="batch_1", status=final_status, output_file_id="file-out"),
+    ])
+    mock_client.files.content = AsyncMock(return_value=SimpleNamespace(text=output_text))
+    return mock_client
+
+
+class TestBatchApi:
+    def _project(self, tmp_path, count=3):
+        names = [f"img{i}.jpg" for i in range(count)]
+        s = _make_project(tmp_path, [(n, (800 + i, 600)) for i, n in enumerate(names)])
+        s = s.model_copy(update={"vision_use_batch_api": True, "vision_batch_threshold": 2})
+        return s, _make_manifest(s, names)
+
+    def test_large_set_submitted_as_one_batch(self, tmp_path):
+        s, manifest = self._project(tmp_path)
+        output = "\n".join(
+            _batch_output_line(p.id, _make_analysis(ocr_text=p.id)) for p in manifest.photos
+        )
+        mock_client = _make_batch_client(output)
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            result = run(s, manifest, _sleep=AsyncMock())
+
+        mock_client.beta.chat.completions.parse.assert_not_called()
+        _, payload = mock_client.files.create.call_args.kwargs["file"]
+        requests = [json.loads(line) for line in payload.decode().splitlines()]
+        assert [r["custom_id"] for r in requests] == ["photo_001", "photo_002", "photo_003"]
+        assert requests[0]["body"]["response_format"]["json_schema"]["strict"] is True
+        assert [e.ocr_text for e in result.enriched_photos] == ["photo_001", "photo_002", "photo_003"]
+        assert len(list(s.analyses_dir.glob("*.json"))) == 3
+
+    def test_failed_line_skips_only_that_photo(self, tmp_path):
+        s, manifest = self._project(tmp_path)
+        failed = json.dumps({
+            "custom_id": "photo_002",
+            "response": {"status_code": 500, "body": {}},
+            "error": {"message": "server error"},
+        })
+        output = "\n".join([
+            _batch_output_line("photo_001", _make_analysis()),
+            failed,
+            _batch_output_line("photo_003", _make_analysis()),
+        ])
+        mock_client = _make_batch_client(output)
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            result = run(s, manifest, _sleep=AsyncMock())
+
+        assert [e.photo_id for e in result.enriched_photos] == ["photo_001", "photo_003"]
+
+    def test_failed_batch_falls_back_to_per_photo_requests(self, tmp_path):
+        s, manifest = self._project(tmp_path)
+        mock_client = _make_batch_client("", final_status="failed")
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            result = run(s, manifest, _sleep=AsyncMock())
+
+        assert mock_client.beta.chat.completions.parse.call_count == 3
+        assert len(result.enriched_photos) == 3
+
+    def test_below_threshold_uses_per_photo_requests(self, tmp_path):
+        s, manifest = self._project(tmp_path, count=1)
+        mock_client = _make_batch_client("")
+
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            run(s, manifest)
+
+        mock_client.batches.create.assert_not_called()
+        assert mock_client.beta.chat.completions.parse.call_count == 1
+
+
 # ---------------------------------------------------------------------------
 # Rate limit retry
 # ---------------------------------------------------------------------------
@@ -373,16 +647,18 @@ class TestRateLimitRetry:
         s = _make_project(tmp_path, [("img.jpg", (800, 600))])
         manifest = _make_manifest(s, ["img.jpg"])
         analysis = _make_analysis(scene_type="result")
-        mock_client = MagicMock()
+        mock_client = _make_client()
         mock_client.beta.chat.completions.parse.side_effect = [
             _RateLimitError("rate limit", response=MagicMock(status_code=429), body={}),
             _RateLimitError("rate limit", response=MagicMock(status_code=429), body={}),
             _make_llm_response(analysis),
         ]
+        sleep = AsyncMock()
 
-        with patch("pipeline.stage3a_enrich.OpenAI", return_value=mock_client), \
-             patch("pipeline.stage3a_enrich.time_module.sleep"):
-            result = run(s, manifest)
+        with patch("pipeline.stage3a_enrich.AsyncOpenAI", return_value=mock_client):
+            result = run(s, manifest, _sleep=sleep)
+
+        assert sleep.await_count == 2
 
         assert mock_client.beta.chat.completions.parse.call_count == 3
         assert result.enriched_photos[0].scene_type == "result"
@@ -1,14 +1,18 @@
 """Tests for Stage 3b Matching."""
+import os
 from datetime import date, datetime, time, timezone
 from pathlib import Path
 
 import pytest
 
+from helpers import fast_settings
 from models.content_plan import ContentItem, ContentPlan
 from models.enriched_photos import EnrichedPhoto, EnrichedPhotoSet
 from models.manifest import AgendaSession, Photo, ProjectManifest, TextSnippet, WorkshopMeta
 from pipeline.stage3b_match import (
+    _semantic_matrix,
     _semantic_score,
+    _temporal_matrix,
     _temporal_score,
     _tokenize,
     run,
@@ -23,7 +27,7 @@ from settings import Settings
 def _settings(tmp_path) -> Settings:
     for d in ("agenda", "fotos", "text", "template"):
         (tmp_path / d).mkdir(exist_ok=True)
-    return Settings(openai_api_key="test", project_dir=tmp_path)
+    return fast_settings(project_dir=tmp_path)
 
 
 def _photo(
@@ -134,6 +138,22 @@ class TestTemporalScore:
         score = _temporal_score(photo, s_untimed, [s_timed, s_untimed])
         assert score == 0.1
 
+    def test_outside_window_decays_linearly_over_30_minutes(self):
+        photo = _photo(ts=datetime(2026, 2, 9, 10, 15, tzinfo=timezone.utc))
+        session = _session(start=time(9, 0), end=time(10, 0))
+        assert _temporal_score(photo, session, [session]) == 0.5
+
+    def test_matrix_covers_every_pair(self):
+        timed = _photo(ts=datetime(2026, 2, 9, 9, 30, tzinfo=timezone.utc))
+        untimed = _photo(ts=None).model_copy(
+            update={"timestamp_file": None, "timestamp_exif": None}
+        )
+        s1 = _session("session_001", 1, "Morning", time(9, 0))
+        s2 = _session("session_002", 2, "Afternoon", time(13, 0))
+        s3 = _session("session_003", 3, "Untimed")
+        matrix = _temporal_matrix([timed, untimed], [s1, s2, s3])
+        assert matrix.tolist() == [[1.0, 0.0, 0.1], [0.5, 0.5, 0.5]]
+
 
 # ---------------------------------------------------------------------------
 # Semantic scoring
@@ -174,6 +194,27 @@ class TestSemanticScore:
         score_without = _semantic_score(enriched, session, [])
         assert score_with > score_without
 
+    def test_words_from_every_snippet_count(self):
+        enriched = _enriched(keywords=["onboarding", "feedback"])
+        session = _session(name="Einstieg")
+        snippets = [
+            TextSnippet(id=f"text_{i:03d}", filename=f"n{i}.md", content=word, word_count=1)
+            for i, word in enumerate(["Onboarding", "Feedback"], start=1)
+        ]
+        # photo {onboarding, feedback, ...description} vs session {einstieg, onboarding, feedback}
+        assert _semantic_score(enriched, session, snippets) > _semantic_score(enriched, session, snippets[:1])
+
+
+class TestSemanticMatrix:
+    def test_process_pool_matches_in_process(self, monkeypatch):
+        photo_words = [{"flipchart", "ideen"}, None, {"ergebnis"}, {"ideen", "gruppe"}, set()]
+        session_words = [{"ideen", "sammeln"}, {"ergebnis", "gruppe"}, set()]
+        expected = _semantic_matrix(photo_words, session_words)
+
+        monkeypatch.setattr("pipeline.stage3b_match._PARALLEL_MIN_PAIRS", 0)
+        monkeypatch.setattr("pipeline.stage3b_match.os.cpu_count", lambda: 2)
+        assert _semantic_matrix(photo_words, session_words) == expected
+
 
 # ---------------------------------------------------------------------------
 # Tokenizer
@@ -199,6 +240,12 @@ class TestTokenize:
     def test_handles_empty(self):
         assert _tokenize("") == set()
 
+    def test_keeps_umlauts_and_eszett(self):
+        assert _tokenize("Übergänge größer Öffnung") == {"übergänge", "größer", "öffnung"}
+
+    def test_drops_tokens_with_digits(self):
+        assert _tokenize("KW12 Ergebnis 2026") == {"ergebnis"}
+
 
 # ---------------------------------------------------------------------------
 # run() — single session
@@ -314,3 +361,20 @@ class TestArtifact:
         )
         assert loaded.items[0].session_ref == plan.items[0].session_ref
         assert loaded.items[0].photo_ids == plan.items[0].photo_ids
+
+    def test_unchanged_artifact_not_rewritten(self, tmp_path):
+        s = _settings(tmp_path)
+        inputs = (_manifest([_session()], [_photo()]), _photo_set([_enriched()]))
+        run(s, *inputs)
+        artifact = s.cache_dir / "content_plan.json"
+        os.utime(artifact, ns=(0, 0))
+        run(s, *inputs)
+        assert artifact.stat().st_mtime_ns == 0
+
+    def test_changed_artifact_rewritten(self, tmp_path):
+        s = _settings(tmp_path)
+        run(s, _manifest([_session()], [_photo()]), _photo_set([_enriched()]))
+        artifact = s.cache_dir / "content_plan.json"
+        os.utime(artifact, ns=(0, 0))
+        run(s, _manifest([_session()], []), _photo_set([]))
+        assert artifact.stat().st_mtime_ns != 0
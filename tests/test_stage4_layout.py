@@ -1,4 +1,7 @@
 """Tests for Stage 4 Layout Planning."""
+import functools
+import json
+import logging
 from datetime import date
 from pathlib import Path
 
@@ -6,6 +9,7 @@ import pytest
 
 from datetime import datetime, timezone
 
+from helpers import fast_settings
 from models.content_plan import ContentItem, ContentPlan
 from models.enriched_photos import CropBox, EnrichedPhoto, EnrichedPhotoSet
 from models.manifest import AgendaSession, Photo, ProjectManifest, WorkshopMeta
@@ -14,17 +18,25 @@ from pipeline.stage4_layout import _format_date_de, run
 from settings import Settings
 
 _NOW = datetime(2026, 2, 9, 12, 0, tzinfo=timezone.utc)
+_FOTOS = Path("fotos")
+_DIMS = {"landscape": (800, 600), "portrait": (600, 800)}
+_GERMAN_MONTHS = (
+    "Januar", "Februar", "März", "April", "Mai", "Juni",
+    "Juli", "August", "September", "Oktober", "November", "Dezember",
+)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
+# Photo, item, enriched-photo, photo-set and plan fixtures use model_construct:
+# inputs here are trusted, so per-field validation would only slow the suite down.
 
 def _settings(tmp_path, max_photos_per_page=2, section_dividers=False) -> Settings:
-    for d in ("agenda", "fotos", "text", "template"):
-        (tmp_path / d).mkdir(exist_ok=True)
-    return Settings(
-        openai_api_key="test",
+    if not (tmp_path / "template").exists():  # class_tmp dirs are already laid out
+        for d in ("agenda", "fotos", "text", "template"):
+            (tmp_path / d).mkdir(exist_ok=True)
+    return fast_settings(
         project_dir=tmp_path,
         max_photos_per_page=max_photos_per_page,
         section_dividers=section_dividers,
@@ -41,18 +53,26 @@ def _manifest(title="Workshop", workshop_date=None, location=None) -> ProjectMan
 
 
 def _manifest_with_photos(photo_orientations: dict[str, str]) -> ProjectManifest:
-    """Build a manifest containing Photo entries with given orientations."""
+    """Build a manifest containing Photo entries with given orientations.
+
+    Memoized per (ordered) orientation mapping; the manifest is never mutated.
+    """
+    return _cached_manifest_with_photos(tuple(photo_orientations.items()))
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_manifest_with_photos(photo_orientations: tuple[tuple[str, str], ...]) -> ProjectManifest:
     photos = [
-        Photo(
+        Photo.model_construct(
             id=pid,
             filename=f"{pid}.jpg",
-            path=Path(f"fotos/{pid}.jpg"),
-            width=800 if orientation == "landscape" else 600,
-            height=600 if orientation == "landscape" else 800,
+            path=_FOTOS / f"{pid}.jpg",
+            width=_DIMS[orientation][0],
+            height=_DIMS[orientation][1],
             orientation=orientation,
             timestamp_file=_NOW,
         )
-        for pid, orientation in photo_orientations.items()
+        for pid, orientation in photo_orientations
     ]
     return ProjectManifest(
         meta=WorkshopMeta(title="Workshop"),
@@ -68,7 +88,7 @@ def _item(
     heading="Workshop",
     photo_ids=None,
 ) -> ContentItem:
-    return ContentItem(
+    return ContentItem.model_construct(
         id=item_id,
         session_ref=session_ref,
         heading=heading,
@@ -84,7 +104,7 @@ def _enriched(
     description="Ein Flipchart.",
     crop_box=None,
 ) -> EnrichedPhoto:
-    return EnrichedPhoto(
+    return EnrichedPhoto.model_construct(
         photo_id=photo_id,
         scene_type="flipchart",
         description=description,
@@ -94,11 +114,62 @@ def _enriched(
 
 
 def _photo_set(enriched_list) -> EnrichedPhotoSet:
-    return EnrichedPhotoSet(enriched_photos=enriched_list)
+    return EnrichedPhotoSet.model_construct(enriched_photos=enriched_list)
 
 
 def _plan(items) -> ContentPlan:
-    return ContentPlan(items=items)
+    return ContentPlan.model_construct(items=items)
+
+
+def _run(s: Settings, manifest, plan, photo_set) -> PagePlan:
+    """Stage 4 without the page_plan.json write; only TestArtifact needs the file."""
+    return run(s, manifest, plan, photo_set, write_artifact=False)
+
+
+def _content_pages(plan: PagePlan) -> list[Page]:
+    return [p for p in plan.pages if p.page_type == "content"]
+
+
+def _first_content(plan: PagePlan) -> Page:
+    return next(p for p in plan.pages if p.page_type == "content")
+
+
+@pytest.fixture(scope="class")
+def class_tmp(tmp_path_factory):
+    """One project dir per test class; only TestArtifact needs a fresh one per test."""
+    p = tmp_path_factory.mktemp("stage4")
+    for d in ("agenda", "fotos", "text", "template"):
+        (p / d).mkdir()
+    return p
+
+
+@pytest.fixture(scope="module")
+def default_manifest() -> ProjectManifest:
+    """_manifest() with defaults; run() never mutates its inputs, so tests share it."""
+    return _manifest()
+
+
+@pytest.fixture(scope="module")
+def empty_plan() -> ContentPlan:
+    return _plan([])
+
+
+@pytest.fixture(scope="module")
+def empty_photo_set() -> EnrichedPhotoSet:
+    return _photo_set([])
+
+
+@pytest.fixture(scope="module")
+def all_enriched() -> list[EnrichedPhoto]:
+    """photo_001 … photo_010; tests slice off as many as they need."""
+    return [_enriched(f"photo_{i:03d}") for i in range(1, 11)]
+
+
+@pytest.fixture(scope="module")
+def default_page_plan(tmp_path_factory, default_manifest, empty_plan, empty_photo_set) -> PagePlan:
+    """run() on the default inputs, computed once for the tests that only inspect it."""
+    s = _settings(tmp_path_factory.mktemp("stage4"))
+    return _run(s, default_manifest, empty_plan, empty_photo_set)
 
 
 # ---------------------------------------------------------------------------
@@ -106,38 +177,31 @@ def _plan(items) -> ContentPlan:
 # ---------------------------------------------------------------------------
 
 class TestCoverPage:
-    def test_first_page_is_cover(self, tmp_path):
-        s = _settings(tmp_path)
-        plan = run(s, _manifest(), _plan([]), _photo_set([]))
-        assert plan.pages[0].page_type == "cover"
+    def test_first_page_is_cover(self, default_page_plan):
+        assert default_page_plan.pages[0].page_type == "cover"
 
-    def test_cover_has_title_block(self, tmp_path):
-        s = _settings(tmp_path)
-        plan = run(s, _manifest(title="Gelingensfaktoren"), _plan([]), _photo_set([]))
+    def test_cover_has_title_block(self, class_tmp, empty_plan, empty_photo_set):
+        s = _settings(class_tmp)
+        plan = _run(s, _manifest(title="Gelingensfaktoren"), empty_plan, empty_photo_set)
         cover = plan.pages[0]
         headings = [b for b in cover.text_blocks if b.role == "heading"]
         assert any("Gelingensfaktoren" in b.content for b in headings)
 
-    def test_cover_includes_date_when_present(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_cover_includes_date_when_present(self, class_tmp, empty_plan, empty_photo_set):
+        s = _settings(class_tmp)
         manifest = _manifest(workshop_date=date(2026, 2, 9))
-        plan = run(s, manifest, _plan([]), _photo_set([]))
-        cover = plan.pages[0]
-        all_text = " ".join(b.content for b in cover.text_blocks)
-        assert "2026" in all_text
+        plan = _run(s, manifest, empty_plan, empty_photo_set)
+        assert any("2026" in b.content for b in plan.pages[0].text_blocks)
 
-    def test_cover_omits_date_when_absent(self, tmp_path):
-        s = _settings(tmp_path)
-        plan = run(s, _manifest(), _plan([]), _photo_set([]))
+    def test_cover_omits_date_when_absent(self, default_page_plan):
         # Only the title block, no date
-        assert len(plan.pages[0].text_blocks) == 1
+        assert len(default_page_plan.pages[0].text_blocks) == 1
 
-    def test_cover_includes_location_when_present(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_cover_includes_location_when_present(self, class_tmp, empty_plan, empty_photo_set):
+        s = _settings(class_tmp)
         manifest = _manifest(location="Berlin")
-        plan = run(s, manifest, _plan([]), _photo_set([]))
-        all_text = " ".join(b.content for b in plan.pages[0].text_blocks)
-        assert "Berlin" in all_text
+        plan = _run(s, manifest, empty_plan, empty_photo_set)
+        assert any("Berlin" in b.content for b in plan.pages[0].text_blocks)
 
 
 # ---------------------------------------------------------------------------
@@ -145,22 +209,16 @@ class TestCoverPage:
 # ---------------------------------------------------------------------------
 
 class TestPageNumbering:
-    def test_pages_are_numbered_sequentially(self, tmp_path):
-        s = _settings(tmp_path)
-        photos = ["photo_001", "photo_002", "photo_003"]
-        enriched = [_enriched(pid) for pid in photos]
-        item = _item(photo_ids=photos)
-        plan = run(s, _manifest(), _plan([item]), _photo_set(enriched))
-        for i, page in enumerate(plan.pages, start=1):
-            assert page.page_number == i
-
-    def test_no_gaps_in_page_numbers(self, tmp_path):
-        s = _settings(tmp_path, section_dividers=True)
-        item = _item(photo_ids=["photo_001"])
-        enriched = [_enriched("photo_001")]
-        plan = run(s, _manifest(), _plan([item]), _photo_set(enriched))
+    @pytest.mark.parametrize("n_photos,section_dividers", [(3, False), (1, True)])
+    def test_pages_numbered_sequentially_without_gaps(
+        self, class_tmp, default_manifest, all_enriched, n_photos, section_dividers
+    ):
+        s = _settings(class_tmp, section_dividers=section_dividers)
+        enriched = all_enriched[:n_photos]
+        item = _item(photo_ids=[e.photo_id for e in enriched])
+        plan = _run(s, default_manifest, _plan([item]), _photo_set(enriched))
         numbers = [p.page_number for p in plan.pages]
-        assert numbers == list(range(1, len(numbers) + 1))
+        assert numbers == list(range(1, len(plan.pages) + 1))
 
 
 # ---------------------------------------------------------------------------
@@ -168,29 +226,29 @@ class TestPageNumbering:
 # ---------------------------------------------------------------------------
 
 class TestSectionDividers:
-    def test_section_divider_inserted_when_enabled(self, tmp_path):
-        s = _settings(tmp_path, section_dividers=True)
+    def test_section_divider_inserted_when_enabled(self, class_tmp, default_manifest):
+        s = _settings(class_tmp, section_dividers=True)
         item = _item(heading="Morgen-Block", photo_ids=["photo_001"])
-        plan = run(s, _manifest(), _plan([item]), _photo_set([_enriched("photo_001")]))
+        plan = _run(s, default_manifest, _plan([item]), _photo_set([_enriched("photo_001")]))
         dividers = [p for p in plan.pages if p.page_type == "section_divider"]
         assert len(dividers) == 1
         assert dividers[0].text_blocks[0].content == "Morgen-Block"
 
-    def test_no_section_divider_when_disabled(self, tmp_path):
-        s = _settings(tmp_path, section_dividers=False)
+    def test_no_section_divider_when_disabled(self, class_tmp, default_manifest):
+        s = _settings(class_tmp, section_dividers=False)
         item = _item(heading="Morgen-Block", photo_ids=["photo_001"])
-        plan = run(s, _manifest(), _plan([item]), _photo_set([_enriched("photo_001")]))
+        plan = _run(s, default_manifest, _plan([item]), _photo_set([_enriched("photo_001")]))
         dividers = [p for p in plan.pages if p.page_type == "section_divider"]
         assert len(dividers) == 0
 
-    def test_multiple_items_each_get_divider(self, tmp_path):
-        s = _settings(tmp_path, section_dividers=True)
+    def test_multiple_items_each_get_divider(self, class_tmp, default_manifest):
+        s = _settings(class_tmp, section_dividers=True)
         items = [
             _item("item_001", heading="Block A", photo_ids=["photo_001"]),
             _item("item_002", "session_002", "Block B", photo_ids=["photo_002"]),
         ]
         enriched = [_enriched("photo_001"), _enriched("photo_002")]
-        plan = run(s, _manifest(), _plan(items), _photo_set(enriched))
+        plan = _run(s, default_manifest, _plan(items), _photo_set(enriched))
         dividers = [p for p in plan.pages if p.page_type == "section_divider"]
         assert len(dividers) == 2
 
@@ -200,82 +258,61 @@ class TestSectionDividers:
 # ---------------------------------------------------------------------------
 
 class TestContentPages:
-    def test_single_photo_produces_one_content_page(self, tmp_path):
-        s = _settings(tmp_path)
-        item = _item(photo_ids=["photo_001"])
-        plan = run(s, _manifest(), _plan([item]), _photo_set([_enriched("photo_001")]))
-        content = [p for p in plan.pages if p.page_type == "content"]
-        assert len(content) == 1
-
-    def test_two_photos_on_one_page_when_max_is_two(self, tmp_path):
-        s = _settings(tmp_path, max_photos_per_page=2)
-        item = _item(photo_ids=["photo_001", "photo_002"])
-        enriched = [_enriched("photo_001"), _enriched("photo_002")]
-        plan = run(s, _manifest(), _plan([item]), _photo_set(enriched))
-        content = [p for p in plan.pages if p.page_type == "content"]
-        assert len(content) == 1
-        assert len(content[0].photo_slots) == 2
-
-    def test_three_photos_split_across_two_pages(self, tmp_path):
-        s = _settings(tmp_path, max_photos_per_page=2)
-        photos = ["photo_001", "photo_002", "photo_003"]
-        item = _item(photo_ids=photos)
-        enriched = [_enriched(pid) for pid in photos]
-        plan = run(s, _manifest(), _plan([item]), _photo_set(enriched))
-        content = [p for p in plan.pages if p.page_type == "content"]
-        assert len(content) == 2
-        assert len(content[0].photo_slots) == 2
-        assert len(content[1].photo_slots) == 1
-
-    def test_max_one_photo_per_page(self, tmp_path):
-        s = _settings(tmp_path, max_photos_per_page=1)
-        photos = ["photo_001", "photo_002"]
-        item = _item(photo_ids=photos)
-        enriched = [_enriched(pid) for pid in photos]
-        plan = run(s, _manifest(), _plan([item]), _photo_set(enriched))
-        content = [p for p in plan.pages if p.page_type == "content"]
-        assert len(content) == 2
-
-    def test_empty_item_produces_no_pages(self, tmp_path):
+    @pytest.mark.parametrize("n_photos,max_per_page,slots_per_page", [
+        (1, 2, [1]),
+        (2, 2, [2]),
+        (3, 2, [2, 1]),
+        (2, 1, [1, 1]),
+    ])
+    def test_photos_distributed_by_max_per_page(
+        self, class_tmp, default_manifest, all_enriched, n_photos, max_per_page, slots_per_page
+    ):
+        s = _settings(class_tmp, max_photos_per_page=max_per_page)
+        enriched = all_enriched[:n_photos]
+        item = _item(photo_ids=[e.photo_id for e in enriched])
+        plan = _run(s, default_manifest, _plan([item]), _photo_set(enriched))
+        assert [len(p.photo_slots) for p in _content_pages(plan)] == slots_per_page
+
+    def test_empty_item_produces_no_pages(self, class_tmp, default_manifest, empty_photo_set):
         # Items with no photos and no text snippet are skipped entirely
-        s = _settings(tmp_path)
+        s = _settings(class_tmp)
         item = _item(photo_ids=[])
-        plan = run(s, _manifest(), _plan([item]), _photo_set([]))
-        content = [p for p in plan.pages if p.page_type == "content"]
+        plan = _run(s, default_manifest, _plan([item]), empty_photo_set)
+        content = _content_pages(plan)
         assert len(content) == 0
 
-    def test_heading_appears_on_first_content_page_only(self, tmp_path):
-        s = _settings(tmp_path, max_photos_per_page=1)
+    def test_heading_appears_on_first_content_page_only(self, class_tmp, default_manifest):
+        s = _settings(class_tmp, max_photos_per_page=1)
         photos = ["photo_001", "photo_002"]
         item = _item(heading="Ergebnisse", photo_ids=photos)
         enriched = [_enriched(pid) for pid in photos]
-        plan = run(s, _manifest(), _plan([item]), _photo_set(enriched))
-        content = [p for p in plan.pages if p.page_type == "content"]
+        plan = _run(s, default_manifest, _plan([item]), _photo_set(enriched))
+        content = _content_pages(plan)
         first_headings = [b for b in content[0].text_blocks if b.role == "heading"]
         second_headings = [b for b in content[1].text_blocks if b.role == "heading"]
         assert len(first_headings) == 1
         assert first_headings[0].content == "Ergebnisse"
         assert len(second_headings) == 0
 
-    def test_page_heading_set_on_all_content_pages(self, tmp_path):
-        s = _settings(tmp_path, max_photos_per_page=1)
+    def test_page_heading_set_on_all_content_pages(self, class_tmp, default_manifest):
+        s = _settings(class_tmp, max_photos_per_page=1)
         photos = ["photo_001", "photo_002", "photo_003"]
         item = _item(heading="Ideensammlung", photo_ids=photos)
         enriched = [_enriched(pid) for pid in photos]
-        plan = run(s, _manifest(), _plan([item]), _photo_set(enriched))
-        content = [p for p in plan.pages if p.page_type == "content"]
+        plan = _run(s, default_manifest, _plan([item]), _photo_set(enriched))
+        content = _content_pages(plan)
         assert all(p.page_heading == "Ideensammlung" for p in content)
 
-    def test_page_heading_set_on_section_divider(self, tmp_path):
-        s = _settings(tmp_path, section_dividers=True)
+    def test_page_heading_set_on_section_divider(self, class_tmp, default_manifest):
+        s = _settings(class_tmp, section_dividers=True)
         item = _item(heading="Morgen-Block", photo_ids=["photo_001"])
-        plan = run(s, _manifest(), _plan([item]), _photo_set([_enriched("photo_001")]))
+        plan = _run(s, default_manifest, _plan([item]), _photo_set([_enriched("photo_001")]))
         dividers = [p for p in plan.pages if p.page_type == "section_divider"]
         assert dividers[0].page_heading == "Morgen-Block"
 
-    def test_cover_has_no_page_heading(self, tmp_path):
-        s = _settings(tmp_path)
-        plan = run(s, _manifest(), _plan([_item()]), _photo_set([]))
+    def test_cover_has_no_page_heading(self, class_tmp, default_manifest, empty_photo_set):
+        s = _settings(class_tmp)
+        plan = _run(s, default_manifest, _plan([_item()]), empty_photo_set)
         cover = plan.pages[0]
         assert cover.page_type == "cover"
         assert cover.page_heading is None
@@ -286,41 +323,36 @@ class TestContentPages:
 # ---------------------------------------------------------------------------
 
 class TestLayoutVariants:
-    def test_single_landscape_is_1photo_fullwidth(self, tmp_path):
-        s = _settings(tmp_path)
-        manifest = _manifest_with_photos({"photo_001": "landscape"})
-        item = _item(photo_ids=["photo_001"])
-        plan = run(s, manifest, _plan([item]), _photo_set([_enriched("photo_001")]))
-        content = [p for p in plan.pages if p.page_type == "content"][0]
-        assert content.layout_variant == "1-photo"
-        assert content.photo_slots[0].display_size == "full-width"
-
-    def test_single_portrait_is_1photo_portrait_pair(self, tmp_path):
-        s = _settings(tmp_path)
-        manifest = _manifest_with_photos({"photo_001": "portrait"})
+    @pytest.mark.parametrize("orientation,display_size", [
+        ("landscape", "full-width"),
+        ("portrait", "portrait-pair"),
+    ])
+    def test_single_photo_is_1photo(self, class_tmp, orientation, display_size):
+        s = _settings(class_tmp)
+        manifest = _manifest_with_photos({"photo_001": orientation})
         item = _item(photo_ids=["photo_001"])
-        plan = run(s, manifest, _plan([item]), _photo_set([_enriched("photo_001")]))
-        content = [p for p in plan.pages if p.page_type == "content"][0]
+        plan = _run(s, manifest, _plan([item]), _photo_set([_enriched("photo_001")]))
+        content = _first_content(plan)
         assert content.layout_variant == "1-photo"
-        assert content.photo_slots[0].display_size == "portrait-pair"
+        assert content.photo_slots[0].display_size == display_size
 
-    def test_manifest_orientation_takes_priority_over_crop_box(self, tmp_path):
+    def test_manifest_orientation_takes_priority_over_crop_box(self, class_tmp):
         # Photo is portrait in manifest, but crop_box says landscape — manifest wins
-        s = _settings(tmp_path)
+        s = _settings(class_tmp)
         manifest = _manifest_with_photos({"photo_001": "portrait"})
         landscape_cb = CropBox(x_min=0.1, y_min=0.2, x_max=0.9, y_max=0.8)
         item = _item(photo_ids=["photo_001"])
-        plan = run(s, manifest, _plan([item]),
+        plan = _run(s, manifest, _plan([item]),
                    _photo_set([_enriched("photo_001", crop_box=landscape_cb)]))
-        content = [p for p in plan.pages if p.page_type == "content"][0]
+        content = _first_content(plan)
         assert content.photo_slots[0].display_size == "portrait-pair"
 
-    def test_two_photos_is_2photo(self, tmp_path):
-        s = _settings(tmp_path, max_photos_per_page=2)
+    def test_two_photos_is_2photo(self, class_tmp, default_manifest):
+        s = _settings(class_tmp, max_photos_per_page=2)
         item = _item(photo_ids=["photo_001", "photo_002"])
         enriched = [_enriched("photo_001"), _enriched("photo_002")]
-        plan = run(s, _manifest(), _plan([item]), _photo_set(enriched))
-        content = [p for p in plan.pages if p.page_type == "content"][0]
+        plan = _run(s, default_manifest, _plan([item]), _photo_set(enriched))
+        content = _first_content(plan)
         assert content.layout_variant == "2-photo"
 
 
@@ -335,22 +367,17 @@ class TestDateFormatting:
     def test_no_leading_zero_on_day(self):
         assert _format_date_de(date(2026, 1, 3)).startswith("3.")
 
-    def test_all_months_in_german(self):
-        expected = [
-            "Januar", "Februar", "März", "April", "Mai", "Juni",
-            "Juli", "August", "September", "Oktober", "November", "Dezember",
-        ]
-        for month_num, name in enumerate(expected, start=1):
-            d = date(2026, month_num, 1)
-            assert name in _format_date_de(d)
+    @pytest.mark.parametrize("month_num,name", list(enumerate(_GERMAN_MONTHS, start=1)))
+    def test_month_in_german(self, month_num, name):
+        assert name in _format_date_de(date(2026, month_num, 1))
 
-    def test_cover_date_uses_german_month(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_cover_date_uses_german_month(self, class_tmp, empty_plan, empty_photo_set):
+        s = _settings(class_tmp)
         manifest = _manifest(workshop_date=date(2026, 2, 9))
-        plan = run(s, manifest, _plan([]), _photo_set([]))
-        cover_text = " ".join(b.content for b in plan.pages[0].text_blocks)
-        assert "Februar" in cover_text
-        assert "February" not in cover_text
+        plan = _run(s, manifest, empty_plan, empty_photo_set)
+        blocks = plan.pages[0].text_blocks
+        assert any("Februar" in b.content for b in blocks)
+        assert not any("February" in b.content for b in blocks)
 
 
 # ---------------------------------------------------------------------------
@@ -358,18 +385,18 @@ class TestDateFormatting:
 # ---------------------------------------------------------------------------
 
 class TestCaptions:
-    def test_caption_comes_from_enriched_description(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_caption_comes_from_enriched_description(self, class_tmp, default_manifest):
+        s = _settings(class_tmp)
         enriched = _enriched("photo_001", description="Moderationskarten zum Thema Vernetzung.")
         item = _item(photo_ids=["photo_001"])
-        plan = run(s, _manifest(), _plan([item]), _photo_set([enriched]))
+        plan = _run(s, default_manifest, _plan([item]), _photo_set([enriched]))
         slot = plan.pages[1].photo_slots[0]
         assert slot.caption == "Moderationskarten zum Thema Vernetzung."
 
-    def test_missing_enriched_gives_empty_caption(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_missing_enriched_gives_empty_caption(self, class_tmp, default_manifest, empty_photo_set):
+        s = _settings(class_tmp)
         item = _item(photo_ids=["photo_001"])
-        plan = run(s, _manifest(), _plan([item]), _photo_set([]))  # no enriched data
+        plan = _run(s, default_manifest, _plan([item]), empty_photo_set)  # no enriched data
         slot = plan.pages[1].photo_slots[0]
         assert slot.caption == ""
 
@@ -379,17 +406,31 @@ class TestCaptions:
 # ---------------------------------------------------------------------------
 
 class TestArtifact:
-    def test_artifact_written(self, tmp_path):
+    def test_artifact_written(self, tmp_path, default_manifest, empty_plan, empty_photo_set):
         s = _settings(tmp_path)
-        run(s, _manifest(), _plan([]), _photo_set([]))
+        run(s, default_manifest, empty_plan, empty_photo_set)
         assert (s.cache_dir / "page_plan.json").exists()
 
-    def test_artifact_roundtrips(self, tmp_path):
+    def test_artifact_roundtrips(self, tmp_path, default_manifest):
         s = _settings(tmp_path)
         item = _item(photo_ids=["photo_001"])
-        result = run(s, _manifest(), _plan([item]), _photo_set([_enriched("photo_001")]))
-        loaded = PagePlan.model_validate_json(
-            (s.cache_dir / "page_plan.json").read_text()
-        )
-        assert len(loaded.pages) == len(result.pages)
-        assert loaded.pages[0].page_type == "cover"
+        result = run(s, default_manifest, _plan([item]), _photo_set([_enriched("photo_001")]))
+        data = json.loads((s.cache_dir / "page_plan.json").read_bytes())
+        assert len(data["pages"]) == len(result.pages)
+        assert data["pages"][0]["page_type"] == "cover"
+
+    def test_artifact_schema_valid(self, tmp_path, default_manifest):
+        s = _settings(tmp_path)
+        item = _item(photo_ids=["photo_001"])
+        result = run(s, default_manifest, _plan([item]), _photo_set([_enriched("photo_001")]))
+        loaded = PagePlan.model_validate_json((s.cache_dir / "page_plan.json").read_bytes())
+        assert loaded == result
+
+    def test_artifact_skipped_when_disabled(
+        self, tmp_path, default_manifest, empty_plan, empty_photo_set, caplog
+    ):
+        s = _settings(tmp_path)
+        with caplog.at_level(logging.INFO, logger="pipeline.stage4_layout"):
+            run(s, default_manifest, empty_plan, empty_photo_set, write_artifact=False)
+        assert not (s.cache_dir / "page_plan.json").exists()
+        assert not any("page_plan.json" in r.getMessage() for r in caplog.records)
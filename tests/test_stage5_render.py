@@ -1,15 +1,30 @@
 """Tests for Stage 5 PDF Rendering."""
-from datetime import date
+import logging
+import os
+import random
+import zlib
+from datetime import date, datetime, timezone
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 
+from helpers import fast_settings
 from models.design import DesignSystem
 from models.enriched_photos import EnrichedPhoto, EnrichedPhotoSet
-from models.manifest import ProjectManifest, WorkshopMeta
+from models.manifest import AgendaSession, Photo, ProjectManifest, WorkshopMeta
 from models.page_plan import Page, PagePlan, PhotoSlot, TextBlock
-from pipeline.stage5_render import _output_path, _render_html, _resolve_photo_path, _slugify, _validate_pdf_fonts, run
+from pipeline.stage5_render import (
+    _build_photo_srcs,
+    _css_for_design,
+    _font_resources,
+    _output_path,
+    _render_html,
+    _resolve_photo_path,
+    _slugify,
+    _validate_pdf_fonts,
+    run,
+)
 from settings import Settings
 
 
@@ -17,10 +32,16 @@ from settings import Settings
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _settings(tmp_path) -> Settings:
+# Default design, validated once; tests that change a design build their own.
+_DESIGN = DesignSystem()
+
+
+@pytest.fixture
+def settings(tmp_path) -> Settings:
+    """Unvalidated Settings over a fresh project tree in ``tmp_path``."""
     for d in ("agenda", "fotos", "text", "template", "output", ".cache"):
-        (tmp_path / d).mkdir(exist_ok=True)
-    return Settings(openai_api_key="test", project_dir=tmp_path)
+        (tmp_path / d).mkdir()
+    return fast_settings(project_dir=tmp_path)
 
 
 def _manifest(title="Workshop", workshop_date=None) -> ProjectManifest:
@@ -32,22 +53,25 @@ def _manifest(title="Workshop", workshop_date=None) -> ProjectManifest:
     )
 
 
+# The shared cover plan and empty photo set use model_construct: their literal
+# values are valid by construction and the helpers run in most tests below.
+# Test-specific plans and photos stay validated.
 def _cover_plan() -> PagePlan:
-    return PagePlan(pages=[
-        Page(
+    return PagePlan.model_construct(pages=[
+        Page.model_construct(
             page_number=1,
             page_type="cover",
             layout_variant="text-only",
             text_blocks=[
-                TextBlock(content="Workshop Titel", role="heading", style_ref="heading"),
-                TextBlock(content="9. Februar 2026", role="body", style_ref="body"),
+                TextBlock.model_construct(content="Workshop Titel", role="heading", style_ref="heading"),
+                TextBlock.model_construct(content="9. Februar 2026", role="body", style_ref="body"),
             ],
         )
     ])
 
 
 def _empty_photo_set() -> EnrichedPhotoSet:
-    return EnrichedPhotoSet()
+    return EnrichedPhotoSet.model_construct()
 
 
 # ---------------------------------------------------------------------------
@@ -61,6 +85,18 @@ class TestSlugify:
     def test_spaces_become_underscores(self):
         assert _slugify("My Workshop") == "my_workshop"
 
+    def test_alphanumeric_title_truncated(self):
+        assert _slugify("Workshop2026" * 10) == ("workshop2026" * 10)[:50]
+
+    @pytest.mark.parametrize("title, expected", [
+        ("  Work  Shop ", "work_shop"),
+        ("a__b", "a_b"),
+        ("Team-Tag_2026", "team_tag_2026"),
+    ])
+    def test_ascii_separators_collapsed(self, title, expected):
+        # Titles with separators skip the alphanumeric fast path
+        assert _slugify(title) == expected
+
     def test_german_umlauts(self):
         assert _slugify("Gelingensfaktoren für Schüler") == "gelingensfaktoren_fuer_schueler"
 
@@ -73,6 +109,12 @@ class TestSlugify:
     def test_ss_eszett(self):
         assert _slugify("Straße") == "strasse"
 
+    def test_decomposed_umlaut(self):
+        assert _slugify("Schu\u0308ler") == "schueler"
+
+    def test_other_accents_folded(self):
+        assert _slugify("Café Dvořák") == "cafe_dvorak"
+
     def test_special_chars_stripped(self):
         assert _slugify("A & B (2026)") == "a_b_2026"
 
@@ -94,23 +136,20 @@ class TestSlugify:
 # ---------------------------------------------------------------------------
 
 class TestOutputPath:
-    def test_with_date(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_with_date(self, settings):
         m = _manifest("Workshop Titel", date(2026, 2, 9))
-        path = _output_path(s, m)
+        path = _output_path(settings, m)
         assert path.name == "fotoprotokoll_workshop_titel_20260209.pdf"
-        assert path.parent == s.output_dir
+        assert path.parent == settings.output_dir
 
-    def test_without_date(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_without_date(self, settings):
         m = _manifest("Workshop")
-        path = _output_path(s, m)
+        path = _output_path(settings, m)
         assert path.name == "fotoprotokoll_workshop.pdf"
 
-    def test_german_title(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_german_title(self, settings):
         m = _manifest("Gelingensfaktoren für Schüler")
-        path = _output_path(s, m)
+        path = _output_path(settings, m)
         assert "fuer" in path.name
         assert "schueler" in path.name
 
@@ -119,27 +158,41 @@ class TestOutputPath:
 # _render_html  (unit tests — no WeasyPrint)
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="module")
+def cover_html() -> str:
+    """The default cover page, rendered once for the read-only checks."""
+    return _render_html(_cover_plan(), _DESIGN, {}, None)
+
+
 class TestRenderHtml:
-    def test_cover_title_in_output(self):
-        html = _render_html(_cover_plan(), DesignSystem(), {}, None)
-        assert "Workshop Titel" in html
-
-    def test_cover_meta_date_in_output(self):
-        html = _render_html(_cover_plan(), DesignSystem(), {}, None)
-        assert "9. Februar 2026" in html
-
-    def test_page_dimensions_in_css(self):
-        html = _render_html(_cover_plan(), DesignSystem(), {}, None)
-        assert "210.0mm" in html
-        assert "297.0mm" in html
-
-    def test_primary_color_in_css(self):
-        html = _render_html(_cover_plan(), DesignSystem(), {}, None)
-        assert "#1A3A5C" in html
-
-    def test_photo_src_embedded(self, tmp_path):
-        img_path = tmp_path / "processed.jpg"
-        img_path.write_bytes(b"FAKEJPEG")
+    def test_cover_title_in_output(self, cover_html):
+        assert "Workshop Titel" in cover_html
+
+    def test_cover_meta_date_in_output(self, cover_html):
+        assert "9. Februar 2026" in cover_html
+
+    def test_page_dimensions_in_css(self, cover_html):
+        assert "210.0mm" in cover_html
+        assert "297.0mm" in cover_html
+
+    def test_primary_color_in_css(self, cover_html):
+        assert "#1A3A5C" in cover_html
+
+    def test_css_rendered_once_per_design(self):
+        _css_for_design.cache_clear()
+        _render_html(_cover_plan(), _DESIGN, {}, None)
+        _render_html(_cover_plan(), _DESIGN, {}, None)
+        assert _css_for_design.cache_info().misses == 1
+        assert _css_for_design.cache_info().hits == 1
+
+    def test_changed_design_gets_own_css(self):
+        design = DesignSystem()
+        design.colors.primary = "#123456"
+        html = _render_html(_cover_plan(), design, {}, None)
+        assert "#123456" in html
+        assert "#123456" not in _render_html(_cover_plan(), _DESIGN, {}, None)
+
+    def test_photo_src_embedded(self):
         plan = PagePlan(pages=[
             Page(
                 page_number=1,
@@ -148,15 +201,13 @@ class TestRenderHtml:
                 photo_slots=[PhotoSlot(photo_id="photo_001", caption="Test", display_size="full-width")],
             )
         ])
-        photo_srcs = {"photo_001": img_path.resolve().as_uri()}
-        html = _render_html(plan, DesignSystem(), photo_srcs, None)
+        photo_srcs = {"photo_001": "file:///project/.cache/processed/processed.jpg"}
+        html = _render_html(plan, _DESIGN, photo_srcs, None)
         assert "processed.jpg" in html
         assert '<img class="photo-img"' in html
 
-    def test_caption_in_alt_attribute(self, tmp_path):
+    def test_caption_in_alt_attribute(self):
         # Captions are not shown as visible text but still present as alt text
-        img_path = tmp_path / "photo.jpg"
-        img_path.write_bytes(b"FAKEJPEG")
         plan = PagePlan(pages=[
             Page(
                 page_number=1,
@@ -167,11 +218,24 @@ class TestRenderHtml:
                 ],
             )
         ])
-        html = _render_html(plan, DesignSystem(), {"p1": img_path.resolve().as_uri()}, None)
+        html = _render_html(plan, _DESIGN, {"p1": "file:///project/fotos/photo.jpg"}, None)
         assert 'alt="Moderationskarten"' in html
         # Caption not rendered as a separate visible div
         assert '<div class="photo-caption">' not in html
 
+    def test_decomposed_text_rendered_as_nfc(self):
+        plan = PagePlan(pages=[
+            Page(
+                page_number=1,
+                page_type="section_divider",
+                layout_variant="text-only",
+                text_blocks=[TextBlock(content="Schu\u0308ler", role="heading", style_ref="heading")],
+            )
+        ])
+        html = _render_html(plan, _DESIGN, {}, None)
+        assert "Schüler" in html
+        assert "\u0308" not in html
+
     def test_section_divider_rendered(self):
         plan = PagePlan(pages=[
             Page(
@@ -181,7 +245,7 @@ class TestRenderHtml:
                 text_blocks=[TextBlock(content="Morgen-Block", role="heading", style_ref="heading")],
             )
         ])
-        html = _render_html(plan, DesignSystem(), {}, None)
+        html = _render_html(plan, _DESIGN, {}, None)
         assert "Morgen-Block" in html
         assert "section-divider" in html
 
@@ -195,7 +259,7 @@ class TestRenderHtml:
                 text_blocks=[TextBlock(content="Ideensammlung", role="heading", style_ref="heading")],
             )
         ])
-        html = _render_html(plan, DesignSystem(), {}, None)
+        html = _render_html(plan, _DESIGN, {}, None)
         assert "Ideensammlung" in html
         assert "page-header-title" in html
 
@@ -208,20 +272,16 @@ class TestRenderHtml:
                  page_heading="Arbeiten im Team",
                  photo_slots=[PhotoSlot(photo_id="p2", caption="", display_size="full-width")]),
         ])
-        html = _render_html(plan, DesignSystem(), {}, None)
+        html = _render_html(plan, _DESIGN, {}, None)
         assert html.count("Arbeiten im Team") == 2
 
-    def test_no_logo_when_none(self):
-        plan = _cover_plan()
-        html = _render_html(plan, DesignSystem(), {}, None)
+    def test_no_logo_when_none(self, cover_html):
         # No img with alt="Logo" on cover
-        assert 'alt="Logo"' not in html
+        assert 'alt="Logo"' not in cover_html
 
-    def test_logo_rendered_when_provided(self, tmp_path):
-        logo = tmp_path / "logo.png"
-        logo.write_bytes(b"PNG")
+    def test_logo_rendered_when_provided(self):
         plan = _cover_plan()
-        html = _render_html(plan, DesignSystem(), {}, logo.resolve().as_uri())
+        html = _render_html(plan, _DESIGN, {}, "file:///project/assets/logo.png")
         assert "logo.png" in html
 
     def test_two_landscape_photos_stacked(self):
@@ -236,7 +296,7 @@ class TestRenderHtml:
                 ],
             )
         ])
-        html = _render_html(plan, DesignSystem(), {}, None)
+        html = _render_html(plan, _DESIGN, {}, None)
         assert html.count('photo-cell photo-cell--full-width') == 2
         assert "photo-grid--stacked" in html
 
@@ -252,7 +312,7 @@ class TestRenderHtml:
                 ],
             )
         ])
-        html = _render_html(plan, DesignSystem(), {}, None)
+        html = _render_html(plan, _DESIGN, {}, None)
         assert html.count('photo-cell photo-cell--portrait-pair') == 2
         assert 'photo-grid photo-grid--stacked' not in html
 
@@ -267,7 +327,7 @@ class TestRenderHtml:
                 ],
             )
         ])
-        html = _render_html(plan, DesignSystem(), {}, None)
+        html = _render_html(plan, _DESIGN, {}, None)
         assert "photo-cell--portrait-pair" in html
         assert "photo-grid--single-portrait" in html
 
@@ -280,7 +340,7 @@ class TestRenderHtml:
             Page(page_number=3, page_type="content", layout_variant="text-only",
                  text_blocks=[TextBlock(content="Inhalt", role="heading", style_ref="heading")]),
         ])
-        html = _render_html(plan, DesignSystem(), {}, None)
+        html = _render_html(plan, _DESIGN, {}, None)
         assert "Titel" in html
         assert "Block A" in html
         assert "Inhalt" in html
@@ -295,8 +355,7 @@ class TestRenderHtml:
 # ---------------------------------------------------------------------------
 
 class TestResolvePhotoPath:
-    def test_processed_path_wins_over_manifest(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_processed_path_wins_over_manifest(self, settings, tmp_path):
         processed = tmp_path / ".cache" / "processed" / "photo_001.jpg"
         processed.parent.mkdir(parents=True, exist_ok=True)
         processed.write_bytes(b"PROCESSED")
@@ -304,76 +363,172 @@ class TestResolvePhotoPath:
         original.write_bytes(b"ORIGINAL")
         manifest_paths = {"photo_001": original}
         result = _resolve_photo_path(
-            Path(".cache/processed/photo_001.jpg"), "photo_001", manifest_paths, s
+            Path(".cache/processed/photo_001.jpg"), "photo_001", manifest_paths, settings
         )
         assert result is not None
         assert result.read_bytes() == b"PROCESSED"
 
-    def test_falls_back_to_manifest_path_when_no_processed(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_falls_back_to_manifest_path_when_no_processed(self, settings, tmp_path):
         original = tmp_path / "fotos" / "IMG_original.jpg"
         original.write_bytes(b"ORIGINAL")
         manifest_paths = {"photo_001": original}
-        result = _resolve_photo_path(None, "photo_001", manifest_paths, s)
+        result = _resolve_photo_path(None, "photo_001", manifest_paths, settings)
         assert result == original
 
-    def test_returns_none_when_nothing_found(self, tmp_path):
-        s = _settings(tmp_path)
-        result = _resolve_photo_path(None, "photo_999", {}, s)
+    def test_returns_none_when_nothing_found(self, settings):
+        result = _resolve_photo_path(None, "photo_999", {}, settings)
         assert result is None
 
-    def test_processed_path_missing_falls_back_to_manifest(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_processed_path_missing_falls_back_to_manifest(self, settings, tmp_path):
         original = tmp_path / "fotos" / "IMG_original.jpg"
         original.write_bytes(b"ORIGINAL")
         manifest_paths = {"photo_001": original}
         # processed_path set but file doesn't exist → fall back
         result = _resolve_photo_path(
-            Path(".cache/processed/missing.jpg"), "photo_001", manifest_paths, s
+            Path(".cache/processed/missing.jpg"), "photo_001", manifest_paths, settings
         )
         assert result == original
 
 
-def _mock_weasyprint():
-    """Context manager: patch the module-level _weasyprint with a fake that writes %PDF."""
-    mock_wp = MagicMock()
-    mock_html_instance = MagicMock()
-    mock_wp.HTML.return_value = mock_html_instance
-    mock_html_instance.write_pdf.side_effect = lambda path, **kw: Path(path).write_bytes(b"%PDF")
-    return patch("pipeline.stage5_render._weasyprint", mock_wp)
+class TestBuildPhotoSrcs:
+    def test_listing_miss_falls_back_to_exists(self, settings, tmp_path):
+        # Case-insensitive file systems: the manifest case differs from the
+        # name on disk, so only Path.exists() finds the file.
+        original = tmp_path / "fotos" / "IMG_0001.jpg"
+        original.write_bytes(b"ORIGINAL")
+        manifest = _manifest()
+        manifest.photos = [Photo.model_construct(id="photo_001", path=Path("fotos/img_0001.jpg"))]
+        ep = EnrichedPhoto(
+            photo_id="photo_001", scene_type="result", description="", analysis_model="gpt-5",
+        )
+        expected = (tmp_path / "fotos" / "img_0001.jpg").resolve()
+        with patch.object(Path, "exists", lambda p: p == expected):
+            srcs = _build_photo_srcs(EnrichedPhotoSet(enriched_photos=[ep]), manifest, settings)
+        assert srcs == {"photo_001": expected.as_uri()}
+
+    def test_relative_project_dir_gives_absolute_uris(self, settings, tmp_path, monkeypatch):
+        (tmp_path / "fotos" / "IMG_0001.jpg").write_bytes(b"ORIGINAL")
+        monkeypatch.chdir(tmp_path)
+        rel_settings = fast_settings(project_dir=Path("."))
+        manifest = _manifest()
+        manifest.photos = [Photo.model_construct(id="photo_001", path=Path("fotos/IMG_0001.jpg"))]
+        ep = EnrichedPhoto(
+            photo_id="photo_001", scene_type="result", description="", analysis_model="gpt-5",
+        )
+        srcs = _build_photo_srcs(EnrichedPhotoSet(enriched_photos=[ep]), manifest, rel_settings)
+        assert srcs == {"photo_001": (tmp_path / "fotos" / "IMG_0001.jpg").resolve().as_uri()}
+
+    def test_one_scan_per_directory(self, settings, tmp_path):
+        processed_dir = tmp_path / ".cache" / "processed"
+        processed_dir.mkdir(parents=True, exist_ok=True)
+        (processed_dir / "photo_001.jpg").write_bytes(b"PROCESSED")
+        original = tmp_path / "fotos" / "IMG_0002.jpg"
+        original.write_bytes(b"ORIGINAL")
+        manifest = _manifest()
+        manifest.photos = [Photo.model_construct(id="photo_002", path=Path("fotos/IMG_0002.jpg"))]
+        photos = [
+            EnrichedPhoto(
+                photo_id="photo_001", scene_type="result", description="",
+                processed_path=Path(".cache/processed/photo_001.jpg"), analysis_model="gpt-5",
+            ),
+            EnrichedPhoto(
+                photo_id="photo_002", scene_type="result", description="",
+                processed_path=Path(".cache/processed/photo_002.jpg"), analysis_model="gpt-5",
+            ),
+        ]
+        with patch("pipeline.stage5_render.os.scandir", wraps=os.scandir) as scandir:
+            srcs = _build_photo_srcs(EnrichedPhotoSet(enriched_photos=photos), manifest, settings)
+        assert scandir.call_count == 2  # processed dir + fotos dir
+        assert srcs == {
+            "photo_001": (processed_dir / "photo_001.jpg").resolve().as_uri(),
+            "photo_002": original.resolve().as_uri(),
+        }
+
+
+class _FakeHTML:
+    """Stand-in for ``weasyprint.HTML``: records the markup, writes a stub PDF."""
+
+    rendered: list[str] | None = None
+
+    def __init__(self, string, base_url):
+        if self.rendered is not None:
+            self.rendered.append(string)
+
+    def write_pdf(self, target, **kwargs):
+        Path(target).write_bytes(b"%PDF")
+
+
+class _FakeFontConfiguration:
+    instances = 0
+
+    def __init__(self):
+        type(self).instances += 1
+
+
+class _FakeWeasyPrint:
+    """Just enough of the weasyprint module surface used by ``run``."""
+
+    HTML = _FakeHTML
+
+    class CSS:
+        def __init__(self, string, font_config=None):
+            self.string = string
+
+    class text:
+        class fonts:
+            FontConfiguration = _FakeFontConfiguration
+
+
+def _mock_weasyprint(rendered_html: list[str] | None = None):
+    """Context manager: patch the module-level _weasyprint with a fake that writes %PDF.
+
+    Rendered HTML strings are appended to ``rendered_html`` when given.
+    """
+    fake = _FakeWeasyPrint
+    if rendered_html is not None:
+        fake = type("_RecordingWeasyPrint", (_FakeWeasyPrint,), {
+            "HTML": type("_RecordingHTML", (_FakeHTML,), {"rendered": rendered_html}),
+        })
+    _font_resources.cache_clear()  # built from whichever module is patched in
+    return patch("pipeline.stage5_render._weasyprint", fake)
 
 
 class TestRun:
-    def test_pdf_written_to_output_dir(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_pdf_written_to_output_dir(self, settings):
         m = _manifest("Workshop", date(2026, 2, 9))
         with _mock_weasyprint():
-            result = run(s, _cover_plan(), _empty_photo_set(), m)
+            result = run(settings, _cover_plan(), _empty_photo_set(), m)
         assert result.exists()
         assert result.suffix == ".pdf"
-        assert result.parent == s.output_dir
+        assert result.parent == settings.output_dir
 
-    def test_pdf_filename_includes_title_and_date(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_pdf_filename_includes_title_and_date(self, settings):
         m = _manifest("Gelingensfaktoren", date(2026, 2, 9))
         with _mock_weasyprint():
-            result = run(s, _cover_plan(), _empty_photo_set(), m)
+            result = run(settings, _cover_plan(), _empty_photo_set(), m)
         assert "gelingensfaktoren" in result.name
         assert "20260209" in result.name
 
-    def test_design_loaded_from_default_when_absent(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_design_loaded_from_default_when_absent(self, settings):
         with _mock_weasyprint():
-            result = run(s, _cover_plan(), _empty_photo_set(), _manifest())
+            result = run(settings, _cover_plan(), _empty_photo_set(), _manifest())
         assert result.exists()
 
-    def test_custom_design_passed_through(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_default_design_fresh_per_run(self, settings):
+        with _mock_weasyprint(), patch(
+            "pipeline.stage5_render._render_html", wraps=_render_html
+        ) as render:
+            run(settings, _cover_plan(), _empty_photo_set(), _manifest())
+            run(settings, _cover_plan(), _empty_photo_set(), _manifest())
+        first, second = (c.args[1] for c in render.call_args_list)
+        assert first == DesignSystem()
+        assert first is not second
+
+    def test_custom_design_passed_through(self, settings):
         with _mock_weasyprint():
-            run(s, _cover_plan(), _empty_photo_set(), _manifest(), design=DesignSystem())
+            run(settings, _cover_plan(), _empty_photo_set(), _manifest(), design=DesignSystem())
 
-    def test_processed_path_used_when_present(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_processed_path_used_when_present(self, settings, tmp_path):
         processed = tmp_path / ".cache" / "processed" / "photo_001.jpg"
         processed.parent.mkdir(parents=True, exist_ok=True)
         processed.write_bytes(b"FAKEJPEG")
@@ -393,24 +548,14 @@ class TestRun:
                  photo_slots=[PhotoSlot(photo_id="photo_001", caption="", display_size="full-width")])
         ])
         rendered_html: list[str] = []
-        mock_wp = MagicMock()
-        def fake_HTML(string, base_url):
-            rendered_html.append(string)
-            inst = MagicMock()
-            inst.write_pdf.side_effect = lambda path, **kw: Path(path).write_bytes(b"%PDF")
-            return inst
-        mock_wp.HTML.side_effect = fake_HTML
-        with patch("pipeline.stage5_render._weasyprint", mock_wp):
-            run(s, plan, photo_set, _manifest())
+        with _mock_weasyprint(rendered_html):
+            run(settings, plan, photo_set, _manifest())
         assert rendered_html, "HTML should have been rendered"
         assert "photo_001.jpg" in rendered_html[0]
 
-    def test_manifest_original_used_when_no_processed_path(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_manifest_original_used_when_no_processed_path(self, settings, tmp_path):
         original = tmp_path / "fotos" / "IMG_workshop.jpg"
         original.write_bytes(b"FAKEJPEG")
-        from models.manifest import AgendaSession, Photo
-        from datetime import datetime, timezone
         _NOW = datetime(2026, 2, 9, 12, 0, tzinfo=timezone.utc)
         photo_set = EnrichedPhotoSet(enriched_photos=[
             EnrichedPhoto(
@@ -440,23 +585,22 @@ class TestRun:
                  photo_slots=[PhotoSlot(photo_id="photo_001", caption="", display_size="full-width")])
         ])
         rendered_html: list[str] = []
-        mock_wp = MagicMock()
-        def fake_HTML(string, base_url):
-            rendered_html.append(string)
-            inst = MagicMock()
-            inst.write_pdf.side_effect = lambda path, **kw: Path(path).write_bytes(b"%PDF")
-            return inst
-        mock_wp.HTML.side_effect = fake_HTML
-        with patch("pipeline.stage5_render._weasyprint", mock_wp):
-            run(s, plan, photo_set, manifest)
+        with _mock_weasyprint(rendered_html):
+            run(settings, plan, photo_set, manifest)
         assert rendered_html
         assert "IMG_workshop.jpg" in rendered_html[0]
 
-    def test_output_dir_created_if_missing(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_font_resources_built_once(self, settings):
+        with _mock_weasyprint():
+            before = _FakeFontConfiguration.instances
+            run(settings, _cover_plan(), _empty_photo_set(), _manifest())
+            run(settings, _cover_plan(), _empty_photo_set(), _manifest())
+        assert _FakeFontConfiguration.instances == before + 1
+
+    def test_output_dir_created_if_missing(self, settings, tmp_path):
         (tmp_path / "output").rmdir()
         with _mock_weasyprint():
-            result = run(s, _cover_plan(), _empty_photo_set(), _manifest())
+            result = run(settings, _cover_plan(), _empty_photo_set(), _manifest())
         assert result.parent.exists()
 
 
@@ -464,15 +608,17 @@ class TestRun:
 # _validate_pdf_fonts
 # ---------------------------------------------------------------------------
 
-def _make_minimal_pdf(tmp_path: Path, with_fonts: bool) -> Path:
-    """Create a minimal PDF file for validation tests."""
-    import zlib
+def _make_minimal_pdf(tmp_path: Path, with_fonts: bool, padding: bytes = b"") -> Path:
+    """Create a minimal PDF file for validation tests.
 
+    ``padding`` is placed in the object stream ahead of the FontDescriptor.
+    """
     if with_fonts:
         # Build an ObjStm containing a FontDescriptor with /FontFile2
         objstm_content = (
             b"1 0\n"
-            b"<</Type /FontDescriptor/FontName /ABCDEF+DejaVu-Sans"
+            + padding
+            + b"<</Type /FontDescriptor/FontName /ABCDEF+DejaVu-Sans"
             b"/FontFile2 99 0 R>>\n"
         )
         compressed = zlib.compress(objstm_content)
@@ -501,14 +647,12 @@ def _make_minimal_pdf(tmp_path: Path, with_fonts: bool) -> Path:
 
 class TestValidatePdfFonts:
     def test_warns_when_no_fonts_embedded(self, tmp_path, caplog):
-        import logging
         pdf = _make_minimal_pdf(tmp_path, with_fonts=False)
         with caplog.at_level(logging.WARNING, logger="pipeline.stage5_render"):
             _validate_pdf_fonts(pdf, "DejaVu Sans")
         assert any("FAILED" in r.message for r in caplog.records)
 
     def test_ok_when_fonts_embedded(self, tmp_path, caplog):
-        import logging
         pdf = _make_minimal_pdf(tmp_path, with_fonts=True)
         with caplog.at_level(logging.INFO, logger="pipeline.stage5_render"):
             _validate_pdf_fonts(pdf, "DejaVu Sans")
@@ -516,7 +660,6 @@ class TestValidatePdfFonts:
         assert any("OK" in r.message for r in caplog.records)
 
     def test_subset_name_detected(self, tmp_path, caplog):
-        import logging
         pdf = _make_minimal_pdf(tmp_path, with_fonts=True)
         with caplog.at_level(logging.INFO, logger="pipeline.stage5_render"):
             _validate_pdf_fonts(pdf, "DejaVu Sans")
@@ -524,10 +667,45 @@ class TestValidatePdfFonts:
         assert ok_records
         assert "ABCDEF+DejaVu-Sans" in ok_records[0].message
 
-    def test_run_calls_validation(self, tmp_path):
-        s = _settings(tmp_path)
+    def test_font_descriptor_deep_in_large_object_stream(self, tmp_path, caplog):
+        rng = random.Random(0)
+        padding = b"".join(
+            b"<</Type /Annot/Contents (" + rng.randbytes(32).hex().encode() + b")>>\n"
+            for _ in range(4000)
+        )
+        pdf = _make_minimal_pdf(tmp_path, with_fonts=True, padding=padding)
+        assert pdf.stat().st_size > 128 * 1024
+        with caplog.at_level(logging.INFO, logger="pipeline.stage5_render"):
+            _validate_pdf_fonts(pdf, "DejaVu Sans")
+        assert not any("FAILED" in r.message for r in caplog.records)
+        assert any("ABCDEF+DejaVu-Sans" in r.message for r in caplog.records)
+
+    def test_only_object_streams_inflated(self, tmp_path):
+        pdf = _make_minimal_pdf(tmp_path, with_fonts=True)
+        content = zlib.compress(b"BT /F1 12 Tf (Hallo) Tj ET" * 1000)
+        data = pdf.read_bytes().replace(
+            b"xref\n",
+            b"2 0 obj\n<</Filter /FlateDecode/Length " + str(len(content)).encode()
+            + b">>\nstream\n" + content + b"\nendstream\nendobj\nxref\n",
+            1,
+        )
+        pdf.write_bytes(data)
+        with patch(
+            "pipeline.stage5_render.zlib.decompressobj", wraps=zlib.decompressobj
+        ) as decompressobj:
+            _validate_pdf_fonts(pdf, "DejaVu Sans")
+        assert decompressobj.call_count == 1
+
+    def test_empty_file_warns(self, tmp_path, caplog):
+        pdf = tmp_path / "empty.pdf"
+        pdf.write_bytes(b"")
+        with caplog.at_level(logging.WARNING, logger="pipeline.stage5_render"):
+            _validate_pdf_fonts(pdf, "DejaVu Sans")
+        assert any("FAILED" in r.message for r in caplog.records)
+
+    def test_run_calls_validation(self, settings):
         with _mock_weasyprint(), patch(
             "pipeline.stage5_render._validate_pdf_fonts"
         ) as mock_validate:
-            result = run(s, _cover_plan(), _empty_photo_set(), _manifest())
+            result = run(settings, _cover_plan(), _empty_photo_set(), _manifest())
         mock_validate.assert_called_once_with(result, "DejaVu Sans")
@@ -6,18 +6,21 @@ title, date, location, participants, and sessions reliably from any format.
 Fallback path: regex-based extraction used when the API is unavailable,
 in offline mode, or in unit tests that mock the API.
 """
+import functools
 import logging
 import re
 import random
 import time as time_module
+from collections.abc import Callable
 from datetime import date, time
 from pathlib import Path
 
-from openai import OpenAI, RateLimitError
+from openai import APIConnectionError, OpenAI, RateLimitError
 from pydantic import BaseModel, ConfigDict
 
 from models.manifest import AgendaSession, WorkshopMeta
 from settings import Settings
+from utils.openai_utils import retry_after_seconds
 from utils.openai_utils import strict_schema as _strict_schema
 
 logger = logging.getLogger(__name__)
@@ -67,16 +70,23 @@ Antworte ausschließlich im vorgegebenen JSON-Schema.
 def parse_agenda(
     agenda_path: Path,
     settings: Settings,
+    *,
+    _client_factory: Callable[..., OpenAI] = OpenAI,
+    _sleep: Callable[[float], None] = time_module.sleep,
 ) -> tuple[WorkshopMeta, list[AgendaSession]]:
     """Parse an agenda file into metadata and sessions.
 
     Uses GPT structured output as the primary extraction method.
     Falls back to regex parsing if the API call fails.
+    ``_client_factory`` builds the OpenAI client and ``_sleep`` is the
+    retry backoff hook; tests pass stubs for both.
     """
     text = _read_text(agenda_path)
 
     try:
-        extraction = _extract_via_llm(text, settings)
+        extraction = _extract_via_llm(
+            text, settings, _client_factory=_client_factory, _sleep=_sleep,
+        )
         logger.info("Agenda parsed via LLM (%s).", settings.text_model)
     except Exception as exc:
         logger.warning("LLM agenda extraction failed (%s); falling back to regex.", exc)
@@ -96,9 +106,21 @@ def parse_agenda(
 # LLM extraction
 # ---------------------------------------------------------------------------
 
-def _extract_via_llm(text: str, settings: Settings) -> _AgendaSchema:
-    client = OpenAI(api_key=settings.openai_api_key)
-    for attempt in range(6):
+_MAX_ATTEMPTS = 6
+_MAX_CONNECTION_ATTEMPTS = 2   # APIConnectionError / APITimeoutError
+_MAX_TOTAL_WAIT = 60.0         # seconds of backoff before giving up on the LLM
+
+
+def _extract_via_llm(
+    text: str,
+    settings: Settings,
+    *,
+    _client_factory: Callable[..., OpenAI] = OpenAI,
+    _sleep: Callable[[float], None] = time_module.sleep,
+) -> _AgendaSchema:
+    client = _client_factory(api_key=settings.openai_api_key)
+    waited = 0.0
+    for attempt in range(_MAX_ATTEMPTS):
         try:
             response = client.beta.chat.completions.parse(
                 model=settings.text_model,
@@ -109,12 +131,23 @@ def _extract_via_llm(text: str, settings: Settings) -> _AgendaSchema:
                 response_format=_AgendaSchema,
             )
             return response.choices[0].message.parsed
-        except RateLimitError:
-            if attempt == 5:
+        except (RateLimitError, APIConnectionError) as exc:
+            # The SDK has already retried connection errors itself; give the
+            # network one more chance, then let the regex fallback take over.
+            limit = _MAX_ATTEMPTS if isinstance(exc, RateLimitError) else _MAX_CONNECTION_ATTEMPTS
+            if attempt + 1 >= limit:
+                raise
+            delay = retry_after_seconds(exc)
+            if delay is None:
+                delay = 2 ** attempt + random.uniform(0, 1)
+            if waited + delay > _MAX_TOTAL_WAIT:
                 raise
-            delay = 2 ** attempt + random.uniform(0, 1)
-            logger.debug("Rate limited; retrying in %.1fs (attempt %d/6).", delay, attempt + 1)
-            time_module.sleep(delay)
+            logger.debug(
+                "%s; retrying in %.1fs (attempt %d/%d).",
+                type(exc).__name__, delay, attempt + 1, limit,
+            )
+            _sleep(delay)
+            waited += delay
 
     raise RuntimeError("Unreachable")  # pragma: no cover
 
@@ -123,62 +156,101 @@ def _extract_via_llm(text: str, settings: Settings) -> _AgendaSchema:
 # Regex fallback
 # ---------------------------------------------------------------------------
 
-_TITLE_RE = re.compile(r'^(?:Titel|Title|Thema|Name)\s*:\s*(.+)$', re.MULTILINE | re.IGNORECASE)
-_DATE_LABEL_RE = re.compile(r'^(?:Datum|Date)\s*:\s*(.+)$', re.MULTILINE | re.IGNORECASE)
-_LOCATION_RE = re.compile(r'^(?:Ort|Location|Veranstaltungsort)\s*:\s*(.+)$', re.MULTILINE | re.IGNORECASE)
-_PARTICIPANTS_RE = re.compile(r'^(?:Teilnehmer|Participants|TN)\s*:\s*(\d+)', re.MULTILINE | re.IGNORECASE)
+# All "Label: value" header lines in one pattern; lastgroup names the field.
+# Zero-width like _DATE_RE: a value may run onto the next line ("Name:\n..."),
+# and that next line must still be tried as a label of its own.
+_FIELDS_RE = re.compile(
+    r'^(?='
+    r'(?:Titel|Title|Thema|Name)\s*:\s*(?P<title>.+)$'
+    r'|(?:Datum|Date)\s*:\s*(?P<date>.+)$'
+    r'|(?:Ort|Location|Veranstaltungsort)\s*:\s*(?P<location>.+)$'
+    r'|(?:Teilnehmer|Participants|TN)\s*:\s*(?P<participants>\d+)'
+    r')',
+    re.MULTILINE | re.IGNORECASE,
+)
 _SESSION_RE = re.compile(r'^\s*(\d{1,2})[:\.](\d{2})\s+(.+)$', re.MULTILINE)
+_DIGIT_RE = re.compile(r'\d')
+_TIME_PREFIX_RE = re.compile(r'^\d{1,2}[:.]\d{2}')
+# Non-empty runs between the separators str.splitlines() recognises
+_LINE_RE = re.compile(r'[^\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]+')
+# DD.MM.YYYY | DD.MM.YY | YYYY-MM-DD. The lookahead makes the scan zero-width,
+# so overlapping candidates are all seen in one pass over the text.
+_DATE_RE = re.compile(
+    r'\b(?=(\d{2})\.(\d{2})\.(\d{4})\b'
+    r'|(\d{2})\.(\d{2})\.(\d{2})\b'
+    r'|(\d{4})-(\d{2})-(\d{2})\b)'
+)
+_CLEAN_DATE_RE = re.compile(r'\d{2}[.\-_]\d{2}[.\-_]\d{2,4}')
+_CLEAN_SUFFIX_RE = re.compile(r'_final|_v\d+|_draft', re.IGNORECASE)
+_CLEAN_SEPARATOR_RE = re.compile(r'[_\-]+')
 
 
 def _extract_via_regex(text: str, path: Path) -> _AgendaSchema:
     """Best-effort regex extraction — used as LLM fallback."""
-    title = _regex_title(text, path)
-    raw_date = _regex_date(text, path)
+    fields = _label_fields(text)
+    title = _regex_title(text, path, fields)
+    raw_date = _regex_date(text, path, fields)
     workshop_date = raw_date.isoformat() if raw_date else None
-    location_match = _LOCATION_RE.search(text)
-    participants_match = _PARTICIPANTS_RE.search(text)
-
-    raw_sessions: list[_SessionSchema] = []
-    for m in _SESSION_RE.finditer(text):
-        name = m.group(3).strip()
-        if name and len(name) > 2:
-            raw_sessions.append(_SessionSchema(
-                name=name,
-                start_time=f"{int(m.group(1)):02d}:{m.group(2)}",
-            ))
-    # Patch end times from next session's start
-    for i in range(len(raw_sessions) - 1):
-        raw_sessions[i] = raw_sessions[i].model_copy(
-            update={"end_time": raw_sessions[i + 1].start_time}
-        )
+    location = fields.get("location")
+    participants = fields.get("participants")
+
+    starts: list[tuple[str, str]] = []
+    for hours, minutes, name in _SESSION_RE.findall(text):
+        name = name.strip()
+        if len(name) > 2:
+            starts.append((name, f"{int(hours):02d}:{minutes}"))
+    # Each session ends where the next one starts; built once with both times.
+    # Every value here comes from our own regex groups and is already the right
+    # type, so the fallback skips validation with model_construct.
+    ends = [start for _, start in starts[1:]] + [None]
+    raw_sessions = [
+        _SessionSchema.model_construct(name=name, start_time=start, end_time=end)
+        for (name, start), end in zip(starts, ends)
+    ]
 
     if not raw_sessions:
-        raw_sessions = [_SessionSchema(name="Workshop")]
+        raw_sessions = [_SessionSchema.model_construct(name="Workshop", start_time=None, end_time=None)]
 
-    return _AgendaSchema(
+    return _AgendaSchema.model_construct(
         title=title,
         workshop_date=workshop_date,
-        location=location_match.group(1).strip() if location_match else None,
-        participants=int(participants_match.group(1)) if participants_match else None,
+        location=location.strip() if location else None,
+        participants=int(participants) if participants else None,
         sessions=raw_sessions,
     )
 
 
-def _regex_title(text: str, path: Path) -> str:
-    m = _TITLE_RE.search(text)
-    if m:
-        return m.group(1).strip()
-    for line in text.splitlines():
-        line = line.strip()
-        if line and not re.match(r'^\d{1,2}[:.]\d{2}', line) and len(line) > 3:
+def _label_fields(text: str) -> dict[str, str]:
+    """Return the first value of each labelled header field, in one pass."""
+    fields: dict[str, str] = {}
+    for m in _FIELDS_RE.finditer(text):
+        name = m.lastgroup
+        if name not in fields:
+            fields[name] = m.group(name)
+            if len(fields) == 4:
+                break
+    return fields
+
+
+def _regex_title(text: str, path: Path, fields: dict[str, str] | None = None) -> str:
+    if fields is None:
+        fields = _label_fields(text)
+    if "title" in fields:
+        return fields["title"].strip()
+    # Lazy line walk: stops at the first candidate instead of splitting the
+    # whole document; cheap length test before the regex.
+    for m in _LINE_RE.finditer(text):
+        line = m.group().strip()
+        if len(line) > 3 and not _TIME_PREFIX_RE.match(line):
             return line
     return _clean_filename(path.stem)
 
 
-def _regex_date(text: str, path: Path) -> date | None:
-    m = _DATE_LABEL_RE.search(text)
-    if m:
-        result = _parse_date_string(m.group(1).strip())
+def _regex_date(text: str, path: Path, fields: dict[str, str] | None = None) -> date | None:
+    if fields is None:
+        fields = _label_fields(text)
+    if "date" in fields:
+        result = _parse_date_string(fields["date"].strip())
         if result:
             return result
     return _parse_date_string(text) or _parse_date_string(path.stem)
@@ -204,10 +276,14 @@ def _sessions_from_schema(raw: list[_SessionSchema]) -> list[AgendaSession]:
 def _parse_time_string(value: str | None) -> time | None:
     if not value:
         return None
-    m = re.match(r'^(\d{1,2}):(\d{2})$', value.strip())
-    if m:
+    # "H:MM" / "HH:MM"; isdecimal() accepts the same digits as a \d regex
+    hours, sep, minutes = value.strip().partition(":")
+    if (
+        sep and 1 <= len(hours) <= 2 and len(minutes) == 2
+        and hours.isdecimal() and minutes.isdecimal()
+    ):
         try:
-            return time(int(m.group(1)), int(m.group(2)))
+            return time(int(hours), int(minutes))
         except ValueError:
             pass
     return None
@@ -222,25 +298,54 @@ def _parse_iso_date(value: str | None) -> date | None:
         return _parse_date_string(value)
 
 
+# Formats by priority: the first format found anywhere in the text wins, and a
+# later format is tried only when that match is not a valid calendar date.
+_DATE_BUILDERS = (
+    lambda g: date(int(g[2]), int(g[1]), int(g[0])),         # DD.MM.YYYY
+    lambda g: date(2000 + int(g[2]), int(g[1]), int(g[0])),  # DD.MM.YY
+    lambda g: date(int(g[0]), int(g[1]), int(g[2])),         # YYYY-MM-DD
+)
+
+
+# Short strings (labels, file stems, LLM dates) recur across calls and re-runs;
+# whole documents are scanned uncached so the cache never pins large texts.
+_DATE_CACHE_MAX_LEN = 4096
+
+
 def _parse_date_string(text: str) -> date | None:
-    for pattern, groups in [
-        (r'\b(\d{2})\.(\d{2})\.(\d{4})\b', lambda m: date(int(m.group(3)), int(m.group(2)), int(m.group(1)))),
-        (r'\b(\d{2})\.(\d{2})\.(\d{2})\b',  lambda m: date(2000 + int(m.group(3)), int(m.group(2)), int(m.group(1)))),
-        (r'\b(\d{4})-(\d{2})-(\d{2})\b',    lambda m: date(int(m.group(1)), int(m.group(2)), int(m.group(3)))),
-    ]:
-        m = re.search(pattern, text)
-        if m:
+    if len(text) <= _DATE_CACHE_MAX_LEN:
+        return _scan_date_cached(text)
+    return _scan_date(text)
+
+
+def _scan_date(text: str) -> date | None:
+    if not _DIGIT_RE.search(text):
+        return None
+    # First match of each format, collected in a single scan
+    found: list[tuple[str, ...] | None] = [None, None, None]
+    for m in _DATE_RE.finditer(text):
+        groups = m.groups()
+        kind = next(k for k in range(3) if groups[3 * k] is not None)
+        if found[kind] is None:
+            found[kind] = groups[3 * kind:3 * kind + 3]
+            if all(found):
+                break
+    for build, groups in zip(_DATE_BUILDERS, found):
+        if groups is not None:
             try:
-                return groups(m)
+                return build(groups)
             except ValueError:
                 pass
     return None
 
 
+_scan_date_cached = functools.lru_cache(maxsize=128)(_scan_date)
+
+
 def _clean_filename(stem: str) -> str:
-    cleaned = re.sub(r'\d{2}[.\-_]\d{2}[.\-_]\d{2,4}', '', stem)
-    cleaned = re.sub(r'_final|_v\d+|_draft', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'[_\-]+', ' ', cleaned).strip()
+    cleaned = _CLEAN_DATE_RE.sub('', stem)
+    cleaned = _CLEAN_SUFFIX_RE.sub('', cleaned)
+    cleaned = _CLEAN_SEPARATOR_RE.sub(' ', cleaned).strip()
     return cleaned if cleaned else stem
 
 
@@ -248,24 +353,38 @@ def _clean_filename(stem: str) -> str:
 # Text reading
 # ---------------------------------------------------------------------------
 
+# The LLM sees the first 8000 characters; the rest is headroom for the regex
+# fallback. Readers stop once they have this much text.
+_MAX_TEXT_CHARS = 32_000
+
+
 def _read_text(path: Path) -> str:
     suffix = path.suffix.lower()
     if suffix == ".docx":
         return _read_docx(path)
     if suffix == ".pdf":
         return _read_pdf(path)
-    return path.read_text(encoding="utf-8", errors="replace")
+    with path.open(encoding="utf-8", errors="replace") as f:
+        return f.read(_MAX_TEXT_CHARS)
 
 
 def _read_docx(path: Path) -> str:
     from docx import Document
     doc = Document(path)
     parts: list[str] = []
+    length = 0
+
+    def add(line: str) -> bool:
+        """Append a line; False once the character budget is used up."""
+        nonlocal length
+        parts.append(line)
+        length += len(line) + 1
+        return length < _MAX_TEXT_CHARS
 
     # Body paragraphs
     for p in doc.paragraphs:
-        if p.text.strip():
-            parts.append(p.text)
+        if p.text.strip() and not add(p.text):
+            return "\n".join(parts)
 
     # Tables — common in structured agendas (time | topic | who)
     for table in doc.tables:
@@ -277,13 +396,21 @@ def _read_docx(path: Path) -> str:
                 if not seen or cell != seen[-1]:
                     seen.append(cell)
             line = " | ".join(c for c in seen if c)
-            if line:
-                parts.append(line)
+            if line and not add(line):
+                return "\n".join(parts)
 
     return "\n".join(parts)
 
 
 def _read_pdf(path: Path) -> str:
     import pdfplumber
+    parts: list[str] = []
+    length = 0
     with pdfplumber.open(path) as pdf:
-        return "\n".join(page.extract_text() or "" for page in pdf.pages)
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            parts.append(text)
+            length += len(text) + 1
+            if length >= _MAX_TEXT_CHARS:
+                break  # later pages are never looked at
+    return "\n".join(parts)
@@ -0,0 +1,38 @@
+"""Shared JSON (de)serialization for pipeline artifacts and caches.
+
+orjson produces the same bytes as ``model.model_dump_json(indent=2)`` for
+our models, but serializes and parses the plain dict trees faster than
+Pydantic's own JSON path.
+"""
+from pathlib import Path
+from typing import TypeVar
+
+import orjson
+from pydantic import BaseModel
+
+_M = TypeVar("_M", bound=BaseModel)
+
+
+def dump_model(model: BaseModel) -> bytes:
+    """Serialize a model as indented UTF-8 JSON."""
+    return orjson.dumps(model.model_dump(mode="json"), option=orjson.OPT_INDENT_2)
+
+
+def load_model(cls: type[_M], data: bytes | str) -> _M:
+    """Parse JSON produced by dump_model (or any standard JSON) into ``cls``."""
+    return cls.model_validate(orjson.loads(data))
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Write ``data`` to ``path`` unless the file already holds exactly these bytes.
+
+    Leaving an identical file untouched keeps its mtime stable on no-op re-runs.
+    Returns True if the file was written.
+    """
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
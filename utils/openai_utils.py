@@ -12,9 +12,32 @@ def strict_schema(schema: dict) -> dict:
     Handles nested models defined in $defs.
     Applied via: model_config = ConfigDict(json_schema_extra=strict_schema)
     """
-    schema["required"] = list(schema.get("properties", {}).keys())
+    schema["required"] = list(schema.get("properties", ()))
     schema["additionalProperties"] = False
     for defn in schema.get("$defs", {}).values():
-        defn["required"] = list(defn.get("properties", {}).keys())
+        if "required" not in defn or len(defn["required"]) != len(defn.get("properties", ())):
+            defn["required"] = list(defn.get("properties", ()))
         defn.setdefault("additionalProperties", False)
     return schema
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return the server-suggested wait from a rate-limit error, if it sent one.
+
+    Reads ``retry-after-ms`` or ``retry-after`` (delta seconds) from the
+    response headers. HTTP-date values and missing or malformed headers
+    yield ``None`` so the caller falls back to its own backoff.
+    """
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is None:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if isinstance(value, str):
+            try:
+                seconds = float(value) * scale
+            except ValueError:
+                continue
+            if 0 <= seconds < float("inf"):
+                return seconds
+    return None